@@ -25,47 +25,183 @@ This script is used to add the license text to all Python files in the project
 """
 
 import os
+import json
+import mmap
+import hashlib
+import stat
+import tempfile
+import concurrent.futures
 import pathspec
 
-# Define the path to the LICENSE file
-license_file_path = 'LICENSE'
+# Directories that are never scanned, checked with a set lookup before the
+# (slower) gitignore pattern matching
+_ALWAYS_IGNORE = {'.git', '__pycache__', '.venv', 'venv', '.mypy_cache', '.pytest_cache', 'node_modules', '.tox', 'build', 'dist'}
 
-# Read the LICENSE text with UTF-8 encoding
-with open(license_file_path, 'r', encoding='utf-8') as file:
-    license_text = file.read()
+# Cache of files already known to contain the license, keyed on path with (mtime, size) of the file
+_CACHE_PATH = '.license_cache.json'
 
-# Define the directory to search for Python files
-directory = '.'
 
-# Read the .gitignore file
-with open('.gitignore', 'r') as file:
-    gitignore = file.read()
+def _collect_python_files(directory, spec):
+    """Return the paths of all Python files in directory that are not ignored by spec."""
+    paths = []
+    for root, dirs, files in os.walk(directory):
+        rel_root = os.path.relpath(root, directory)
+        
+        # Prune directories listed in .gitignore before descending into them
+        # (trailing slash gives the pattern directory semantics)
+        dirs[:] = [d for d in dirs if d not in _ALWAYS_IGNORE]
+        dirs[:] = [d for d in dirs if not spec.match_file(f"{os.path.normpath(os.path.join(rel_root, d))}/")]
+        
+        for file in files:
+            # Skip files listed in .gitignore
+            if file.endswith('.py') and not spec.match_file(os.path.normpath(os.path.join(rel_root, file))):
+                paths.append(os.path.join(root, file))
+    return paths
+
+
+def _load_cache(cache_path, license_hash):
+    """Load the file cache. The cache is discarded if it was made for a different license text."""
+    try:
+        with open(cache_path, 'r', encoding='utf-8') as file:
+            cache = json.load(file)
+    except (OSError, ValueError):
+        return {}
+    if cache.get('license') != license_hash:
+        return {}
+    return cache.get('files', {})
+
+
+def _save_cache(cache_path, license_hash, files):
+    with open(cache_path, 'w', encoding='utf-8') as file:
+        json.dump({'license': license_hash, 'files': files}, file, indent=1)
+
+
+def _stat_key(file_path):
+    st = os.stat(file_path)
+    return [st.st_mtime_ns, st.st_size, True]
+
+
+def _init_worker(license_text):
+    """Encode the license and the header to prepend once per worker process."""
+    global license_bytes, license_bytes_crlf, header_bytes, header_bytes_crlf, header_markers
+    # Files are processed as bytes. Files checked out with CRLF line endings are matched against a CRLF variant
+    license_bytes = license_text.encode('utf-8')
+    license_bytes_crlf = license_bytes.replace(b'\n', b'\r\n')
+    header_bytes = f'"""{license_text}"""\n\n'.encode('utf-8')
+    header_bytes_crlf = header_bytes.replace(b'\n', b'\r\n')
+    
+    # Opening bytes of a file that starts with the header written by this script
+    header_markers = (header_bytes[:120], header_bytes_crlf[:120])
 
-# Create a pathspec from the .gitignore file
-spec = pathspec.PathSpec.from_lines('gitwildmatch', gitignore.splitlines())
 
-# Iterate over all files in the directory
-for root, _, files in os.walk(directory):
-    for file in files:
-        file_path = os.path.join(root, file)
+def _write_all(fd, buffers):
+    """Write all buffers to fd with vectored (gather) writes where available (POSIX), handling partial writes."""
+    buffers = [memoryview(buffer) for buffer in buffers]
+    while buffers:
+        if hasattr(os, 'writev'):
+            written = os.writev(fd, buffers)
+        else:
+            written = os.write(fd, buffers[0])
+        while buffers and written >= len(buffers[0]):
+            written -= len(buffers.pop(0))
+        if buffers:
+            buffers[0] = buffers[0][written:]
+
+
+def _write_temporary_file(file_path, header, body):
+    """Write header followed by body to a temporary file next to file_path. Returns the temporary path."""
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(file_path))
+    try:
+        _write_all(fd, [header, body])
+    except OSError:
+        os.close(fd)
+        os.remove(tmp_path)
+        raise
+    os.close(fd)
+    return tmp_path
+
+
+def _replace_file(tmp_path, file_path, mode):
+    """Atomically replace file_path with tmp_path, setting the file mode of the original."""
+    try:
+        os.chmod(tmp_path, stat.S_IMODE(mode))
+        os.replace(tmp_path, file_path)
+    except OSError:
+        os.remove(tmp_path)
+        raise
+
+
+def _check_and_rewrite(file_path):
+    """Prepend the license to file_path if it is not already present. Returns True if the file was modified."""
+    # Read the start of the file. The license is prepended at the top, so a
+    # bounded prefix is enough for files that already have it
+    prefix_length = len(license_bytes_crlf) + 64
+    with open(file_path, 'rb') as original_file:
+        head = original_file.read(prefix_length)
+        
+        # Files licensed by this script start with the header, which is a fixed-cost comparison.
+        # Otherwise (e.g. a shebang or encoding line above the license) fall back to searching the prefix
+        if head.startswith(header_markers):
+            return False
+        if license_bytes in head or license_bytes_crlf in head:
+            return False
+        
+        # Everything about the original is taken from this single open file descriptor
+        mode = os.fstat(original_file.fileno()).st_mode
         
-        # Skip files and directories listed in .gitignore
-        if spec.match_file(file_path):
-            continue
+        # The body is copied unchanged, so the header is written with the line endings of the file
+        header = header_bytes_crlf if b'\r\n' in head else header_bytes
         
-        if file.endswith('.py'):
-            # Read the original content of the file with UTF-8 encoding
-            with open(file_path, 'r', encoding='utf-8') as original_file:
-                print(file_path)
-                original_content = original_file.read()
-            
-            # Check if the LICENSE text is already present
-            if license_text not in original_content:
-                # Prepend the LICENSE text to the original content
-                new_content = f'"""{license_text}"""\n\n{original_content}'
-                
-                # Write the new content back to the file with UTF-8 encoding
-                with open(file_path, 'w', encoding='utf-8') as modified_file:
-                    modified_file.write(new_content)
-
-print("LICENSE text added to all Python files where it was not already present.")
\ No newline at end of file
+        if len(head) < prefix_length:
+            # Files shorter than the prefix have been read completely
+            tmp_path = _write_temporary_file(file_path, header, head)
+        else:
+            # Check if the LICENSE text is present further down in the file, searching a
+            # memory mapped view of the file instead of reading it into memory. The
+            # mapped view is also the source of the write, so the body is never copied
+            with mmap.mmap(original_file.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                if mm.find(license_bytes) != -1 or mm.find(license_bytes_crlf) != -1:
+                    return False
+                tmp_path = _write_temporary_file(file_path, header, mm)
+    
+    # The original is closed before it is replaced, which is required on Windows
+    _replace_file(tmp_path, file_path, mode)
+    return True
+
+
+if __name__ == '__main__':
+    # Define the path to the LICENSE file
+    license_file_path = 'LICENSE'
+    
+    # Read the LICENSE text with UTF-8 encoding
+    with open(license_file_path, 'r', encoding='utf-8') as file:
+        license_text = file.read()
+    
+    # Define the directory to search for Python files
+    directory = '.'
+    
+    # Read the .gitignore file
+    with open('.gitignore', 'r') as file:
+        gitignore = file.read()
+    
+    # Create a pathspec from the .gitignore file
+    spec = pathspec.PathSpec.from_lines('gitwildmatch', gitignore.splitlines())
+    
+    # Files that are unchanged since they were last processed are skipped without being opened
+    license_hash = hashlib.sha256(license_text.encode('utf-8')).hexdigest()
+    cache = _load_cache(_CACHE_PATH, license_hash)
+    
+    # First pass: collect the Python files. Second pass: check and rewrite them in parallel. 
+    # The executor chooses the number of worker processes (limited to 61 on Windows)
+    paths = [p for p in _collect_python_files(directory, spec) if cache.get(p) != _stat_key(p)]
+    with concurrent.futures.ProcessPoolExecutor(
+        initializer=_init_worker,
+        initargs=(license_text,),
+    ) as executor:
+        for file_path, _ in zip(paths, executor.map(_check_and_rewrite, paths, chunksize=32)):
+            print(file_path)
+            cache[file_path] = _stat_key(file_path)
+    
+    _save_cache(_CACHE_PATH, license_hash, cache)
+    
+    print("LICENSE text added to all Python files where it was not already present.")
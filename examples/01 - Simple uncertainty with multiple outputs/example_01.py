@@ -40,6 +40,7 @@ Created on Thu Apr 18 13:11:41 2024
 
 import os
 import pandas as pd
+import numpy as np
 from uncertaintylib import uncertainty_functions
 
 # Load input parameters from CSV file in the same folder as the script
@@ -57,6 +58,9 @@ def my_function(input_dict):
     In the input CSV (examples/example_01_input.csv), a setting is handled by setting its distribution to 'none'.
     This means the code will not calculate sensitivity coefficients for that particular input value, treating it as a constant.
 
+    The inputs can be single values or arrays of Monte Carlo samples. The setting is therefore applied with 
+    np.where instead of an if statement, so the function can be used in a vectorized Monte Carlo simulation.
+
     Args:
         input_dict (dict): Dictionary of input values.
 
@@ -69,12 +73,9 @@ def my_function(input_dict):
     a = x + y
     b = y - x
     c = x * y
-    if setting_A==0:
-        d = y / x
-    else:
-        d = y / (x+1)
-    if setting_A%1!=0:
+    if np.any(setting_A%1!=0):
         raise Exception('Some exception')
+    d = y / np.where(setting_A==0, x, x+1)
     output_dict = {'a': a, 'b': b, 'c': c, 'd': d, 'x_used' : x, 'y_used' : y, 'setting_A_used' : setting_A}
     return output_dict
 
@@ -86,7 +87,7 @@ print('\nRelative sensitivity coefficients: ')
 print(pd.DataFrame(sensitivities['relative_sensitivity_coefficients']))
 
 # Step 2: Run Monte Carlo simulation to propagate input uncertainties
-mc_res = uncertainty_functions.monte_carlo_simulation(mc_input, my_function, 10000)
+mc_res = uncertainty_functions.monte_carlo_simulation(mc_input, my_function, 10000, vectorized=True)
 mc_stats = uncertainty_functions.calculate_monte_carlo_statistics(mc_res)
 
 # Step 3: Plot distributions of input and output values
@@ -107,8 +108,8 @@ print(mc_stats)
 # Step 5: Calculate correlations between Monte Carlo output variables
 mc_correlations = uncertainty_functions.monte_carlo_output_correlations(mc_res, return_as_dataframe=True)
 
-# Step 6: Calculate conventional uncertainty results
-uncertainty_results = uncertainty_functions.calculate_uncertainty(mc_input, my_function)
+# Step 6: Calculate conventional uncertainty results, reusing the sensitivity coefficients from step 1
+uncertainty_results = uncertainty_functions.calculate_uncertainty(mc_input, my_function, sensitivity_results=sensitivities)
 
 # Step 7: Compare Monte Carlo results to conventional uncertainty calculation
 comparison = uncertainty_functions.compare_monte_carlo_to_conventional_uncertainty_calculation(
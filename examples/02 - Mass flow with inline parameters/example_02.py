@@ -52,6 +52,7 @@ mc_input = {
 }
 
 def calculate_massflow(input_dict):
+    # Works on both single values and arrays of Monte Carlo samples
     massflow = input_dict['Q']*input_dict['rho']
     output_dict = {'massflow' : massflow}
     return output_dict
@@ -64,7 +65,8 @@ print('\nRelative sensitivity coefficients: ')
 print(pd.DataFrame(sensitivities['relative_sensitivity_coefficients']))
 
 # Step 2: Run Monte Carlo simulation to propagate input uncertainties
-mc_res = uncertainty_functions.monte_carlo_simulation(mc_input, calculate_massflow, 10000)
+# calculate_massflow supports arrays, so all samples are evaluated in a single vectorized call
+mc_res = uncertainty_functions.monte_carlo_simulation(mc_input, calculate_massflow, 10000, vectorized=True)
 mc_stats = uncertainty_functions.calculate_monte_carlo_statistics(mc_res)
 
 # Step 3: Print Monte Carlo statistics
@@ -73,8 +75,8 @@ print(mc_stats)
 # Step 4: Calculate correlations between Monte Carlo output variables
 mc_correlations = uncertainty_functions.monte_carlo_output_correlations(mc_res, return_as_dataframe=True)
 
-# Step 5: Calculate conventional uncertainty results
-uncertainty_results = uncertainty_functions.calculate_uncertainty(mc_input, calculate_massflow)
+# Step 5: Calculate conventional uncertainty results, reusing the sensitivity coefficients from step 1
+uncertainty_results = uncertainty_functions.calculate_uncertainty(mc_input, calculate_massflow, sensitivity_results=sensitivities)
 
 # Step 6: Compare Monte Carlo results to conventional uncertainty calculation
 comparison = uncertainty_functions.compare_monte_carlo_to_conventional_uncertainty_calculation(
@@ -42,7 +42,6 @@ Created on Thu Apr 18 13:11:41 2024
 import os
 import pandas as pd
 import numpy as np
-import math
 from uncertaintylib import uncertainty_functions
 
 # Load input parameters from CSV file in the same folder as the script
@@ -50,16 +49,17 @@ csv_path = os.path.join(os.path.dirname(__file__), 'example_03_input.csv')
 mc_input = pd.read_csv(csv_path).set_index('input_name').to_dict()
 
 def calculate_massflow(input_dict):
+    # Inputs may be scalars or arrays of Monte Carlo samples, the calculation is element-wise
     R = 8.314 #J/molK
     C = input_dict['C']
     epsilon = input_dict['epsilon']
     D = input_dict['D']/1000 #m
     d = input_dict['d']/1000 #m
-    deltaP = input_dict['deltaP']*100 #Pa
-    P1 = input_dict['P'] * 10**5 #Pa
+    deltaP = input_dict['deltaP']*100.0 #Pa
+    P1 = input_dict['P']*1.0e5 #Pa
     T = input_dict['T']
     m_div_Z = input_dict['m/Z'] #kg/mol
-    qm = (C/np.sqrt(1-((d/D)**4)))*(epsilon*math.pi*(d**2)/4)*np.sqrt((2*P1*deltaP*m_div_Z)/(R*T))
+    qm = (C/np.sqrt(1-((d/D)**4)))*(epsilon*np.pi*(d**2)/4)*np.sqrt((2*P1*deltaP*m_div_Z)/(R*T))
     output_dict = {'qm' : qm}
     return output_dict
 
@@ -71,7 +71,7 @@ print('\nRelative sensitivity coefficients: ')
 print(pd.DataFrame(sensitivities['relative_sensitivity_coefficients']))
 
 # Step 2: Run Monte Carlo simulation to propagate input uncertainties
-mc_res = uncertainty_functions.monte_carlo_simulation(mc_input, calculate_massflow, 10000)
+mc_res = uncertainty_functions.monte_carlo_simulation(mc_input, calculate_massflow, 10000, vectorized=True)
 mc_stats = uncertainty_functions.calculate_monte_carlo_statistics(mc_res)
 
 # Step 3: Print Monte Carlo statistics
@@ -80,8 +80,8 @@ print(mc_stats)
 # Step 4: Calculate correlations between Monte Carlo output variables
 mc_correlations = uncertainty_functions.monte_carlo_output_correlations(mc_res, return_as_dataframe=True)
 
-# Step 5: Calculate conventional uncertainty results
-uncertainty_results = uncertainty_functions.calculate_uncertainty(mc_input, calculate_massflow)
+# Step 5: Calculate conventional uncertainty results, reusing the sensitivity coefficients from step 1
+uncertainty_results = uncertainty_functions.calculate_uncertainty(mc_input, calculate_massflow, sensitivity_results=sensitivities)
 
 # Step 6: Compare Monte Carlo results to conventional uncertainty calculation
 comparison = uncertainty_functions.compare_monte_carlo_to_conventional_uncertainty_calculation(
@@ -39,45 +39,69 @@ Created on Thu Apr 18 13:11:41 2024
 """
 
 import os
+import csv
 import pandas as pd
 import numpy as np
 from uncertaintylib import uncertainty_functions
 
 # Load input parameters from CSV file in the same folder as the script
 csv_path = os.path.join(os.path.dirname(__file__), 'example_05_input.csv')
-mc_input = pd.read_csv(csv_path).set_index('input_name').to_dict()
+def _coerce(value):
+    # Empty cells become nan, numbers become floats and other values (such as the distribution) are kept as strings
+    if value == '':
+        return np.nan
+    try:
+        return float(value)
+    except ValueError:
+        return value
+
+with open(csv_path, newline='') as f:
+    rows = list(csv.DictReader(f))
+
+mc_input = {col: {r['input_name']: _coerce(r[col]) for r in rows} for col in rows[0] if col != 'input_name'}
+
+# AGA8 molar masses [g/mol], in a fixed component order
+_ORDER = ('N2', 'CO2', 'C1', 'C2', 'C3', 'iC4', 'nC4', 'iC5', 'nC5', 'nC6', 'nC7', 'nC8', 'nC9', 'nC10')
+_MM = np.array([
+    28.01351929,
+    44.00979996,
+    16.0428791,
+    30.0698204,
+    44.0967598,
+    58.12369919,
+    58.12369919,
+    72.1506424,
+    72.1506424,
+    86.17758179,
+    100.2044983,
+    114.2314606,
+    128.2584076,
+    142.2852936
+    ], dtype=np.float64)
+_MM.setflags(write=False) # Constant, shared by all calls
 
 def calculate_massflow(input_dict):
-    aga8_mm = {'N2': 28.01351929,
-     'CO2': 44.00979996,
-     'C1': 16.0428791,
-     'C2': 30.0698204,
-     'C3': 44.0967598,
-     'iC4': 58.12369919,
-     'nC4': 58.12369919,
-     'iC5': 72.1506424,
-     'nC5': 72.1506424,
-     'nC6': 86.17758179,
-     'nC7': 100.2044983,
-     'nC8': 114.2314606,
-     'nC9': 128.2584076,
-     'nC10': 142.2852936
-     }
-    fluid_DF = pd.DataFrame({'moleperc' : input_dict, 'mm' : aga8_mm})
-    fluid_DF['moleperc'] = 100*fluid_DF['moleperc']/fluid_DF['moleperc'].sum()
-    MM = np.dot(fluid_DF['moleperc'],fluid_DF['mm'])/fluid_DF['moleperc'].sum()
+    # The inputs can either be single values, or arrays of Monte Carlo samples (x then has shape (N, 14))
+    x = np.stack([np.asarray(input_dict[k], dtype=np.float64) for k in _ORDER], axis=-1)
+    
+    # Normalization of the composition to 100 % cancels out in the ratio
+    MM = (x @ _MM) / x.sum(axis=-1)
+    
     output_dict = {'MolarMass' : MM}
+    
     return output_dict
 
 # Step 1: Calculate sensitivity coefficients for each input
-sensitivities = uncertainty_functions.calculate_sensitivity_coefficients(mc_input, calculate_massflow)
+# calculate_massflow supports arrays, so the outputs of all perturbed inputs are evaluated in a single call
+sensitivities = uncertainty_functions.calculate_sensitivity_coefficients(mc_input, calculate_massflow, vectorized=True)
 print('Sensitivity coefficients: ')
 print(pd.DataFrame(sensitivities['absolute_sensitivity_coefficients']))
 print('\nRelative sensitivity coefficients: ')
 print(pd.DataFrame(sensitivities['relative_sensitivity_coefficients']))
 
 # Step 2: Run Monte Carlo simulation to propagate input uncertainties
-mc_res = uncertainty_functions.monte_carlo_simulation(mc_input, calculate_massflow, 10000)
+# calculate_massflow supports arrays, so all samples are evaluated in a single vectorized call
+mc_res = uncertainty_functions.monte_carlo_simulation(mc_input, calculate_massflow, 10000, vectorized=True)
 mc_stats = uncertainty_functions.calculate_monte_carlo_statistics(mc_res)
 
 # Step 3: Print Monte Carlo statistics
@@ -86,8 +110,8 @@ print(mc_stats)
 # Step 4: Calculate correlations between Monte Carlo output variables
 mc_correlations = uncertainty_functions.monte_carlo_output_correlations(mc_res, return_as_dataframe=True)
 
-# Step 5: Calculate conventional uncertainty results
-uncertainty_results = uncertainty_functions.calculate_uncertainty(mc_input, calculate_massflow)
+# Step 5: Calculate conventional uncertainty results, reusing the sensitivity coefficients from step 1
+uncertainty_results = uncertainty_functions.calculate_uncertainty(mc_input, calculate_massflow, sensitivity_results=sensitivities)
 
 # Step 6: Compare Monte Carlo results to conventional uncertainty calculation
 comparison = uncertainty_functions.compare_monte_carlo_to_conventional_uncertainty_calculation(
@@ -27,14 +27,14 @@ for uncertainty propagation in mass flow calculations.
 
 Comparison:
 -----------
-- Sequential: Single-process Monte Carlo simulation
+- Sequential: Single-process vectorized Monte Carlo simulation, evaluating all perturbations in one call
 - Parallel: Multi-process batch Monte Carlo simulation using {num_processes} CPU cores
 - Number of perturbations: {N} simulations per method
 
 The script performs the following:
 1. Loads input parameters with uncertainties from a CSV file
 2. Runs a baseline sequential Monte Carlo simulation
-3. Runs a parallelized batch Monte Carlo simulation
+3. Runs a parallelized batch Monte Carlo simulation, if N is large enough for it to pay off
 4. Compares execution times and statistical results (mean, std dev)
 
 The mass flow calculation is based on ISO 5167 orifice plate equations,
@@ -42,14 +42,16 @@ propagating uncertainties through the calculation using Monte Carlo methods.
 
 Key Features:
 -------------
-- Utilizes multiprocessing.Pool for parallel execution
+- Evaluates the mass flow calculation on arrays of perturbations (vectorized)
+- Utilizes concurrent.futures.ProcessPoolExecutor for parallel execution
 - Splits simulations into equal-sized batches across available CPU cores
+- Parses the input parameters once, and passes them to each worker process when it starts
 - Provides detailed timing and statistical comparison metrics
 - Validates parallel results against baseline sequential results
 
 Dependencies:
 -------------
-- pandas, numpy, multiprocessing
+- pandas, numpy, concurrent.futures
 - uncertaintylib.uncertainty_functions (custom library)
 
 Input:
@@ -57,7 +59,7 @@ Input:
 - example_03_input.csv: CSV file containing input parameters and their uncertainties
 
 Output:
--------
+------
 - Baseline and parallel Monte Carlo statistics (mean, std dev, etc.)
 - Execution time comparison and speedup metrics
 - Statistical validation comparing both methods
@@ -65,48 +67,93 @@ Output:
 import os
 import pandas as pd
 import numpy as np
-import math
 import time
-from multiprocessing import Pool, cpu_count
+from concurrent.futures import ProcessPoolExecutor
 from uncertaintylib import uncertainty_functions
 
+# Conversion factors from the units of the input file to SI units
+_SI_UNITS = {
+    'D': (1/1000, 'm'), # mm to m
+    'd': (1/1000, 'm'), # mm to m
+    'deltaP': (100.0, 'Pa'), # mbar to Pa
+    'P': (1.0e5, 'Pa'), # bara to Pa
+}
+
+def _read_inputs(csv_path):
+    """Read the input parameters from csv_path, converted to SI units once instead of for every perturbation"""
+    mc_input = pd.read_csv(csv_path).set_index('input_name').to_dict()
+    for key, (factor, unit) in _SI_UNITS.items():
+        for field in ['mean', 'standard_uncertainty', 'min', 'max']:
+            mc_input[field][key] = mc_input[field][key]*factor
+        mc_input['unit'][key] = unit
+    return mc_input
+
+# Constant factors of the orifice equation, folded once
+_PI_OVER_4 = np.pi/4
+_TWO_OVER_R = 2/8.314 #R = 8.314 J/molK
+
+def _qm_kernel(C, epsilon, D, d, deltaP, P1, T, m_div_Z):
+    """Element-wise orifice mass flow [kg/s], with inputs in SI units"""
+    # Same as (C/sqrt(1-(d/D)**4))*(epsilon*pi*d**2/4)*sqrt(2*P1*deltaP*m_div_Z/(R*T)),
+    # with the two square roots merged into one
+    beta = d/D
+    return C*epsilon*_PI_OVER_4*d*d*np.sqrt(_TWO_OVER_R*P1*deltaP*m_div_Z/(T*(1-beta**4)))
+
 def calculate_massflow(input_dict):
-    R = 8.314 #J/molK
-    C = input_dict['C']
-    epsilon = input_dict['epsilon']
-    D = input_dict['D']/1000 #m
-    d = input_dict['d']/1000 #m
-    deltaP = input_dict['deltaP']*100 #Pa
-    P1 = input_dict['P'] * 10**5 #Pa
-    T = input_dict['T']
-    m_div_Z = input_dict['m/Z'] #kg/mol
-    qm = (C/np.sqrt(1-((d/D)**4)))*(epsilon*math.pi*(d**2)/4)*np.sqrt((2*P1*deltaP*m_div_Z)/(R*T))
+    qm = _qm_kernel(
+        input_dict['C'],
+        input_dict['epsilon'],
+        input_dict['D'], #m
+        input_dict['d'], #m
+        input_dict['deltaP'], #Pa
+        input_dict['P'], #Pa
+        input_dict['T'],
+        input_dict['m/Z'], #kg/mol
+    )
     output_dict = {'qm' : qm}
     return output_dict
 
+def usable_cpu_count():
+    """Number of CPU cores this process may run on, which can be less than the total on containers or with CPU affinity set"""
+    if hasattr(os, 'process_cpu_count'): # Python 3.13+
+        return os.process_cpu_count() or 1
+    if hasattr(os, 'sched_getaffinity'):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+# Input parameters of the worker process, set once by _set_inputs
+mc_input = None
+
+def _set_inputs(inputs):
+    """Set the input parameters once per worker process, as parsed by the main process"""
+    global mc_input
+    mc_input = inputs
+
 # Function to run a single batch
-def run_batch(batch_size):
-    """Run Monte Carlo simulation for a single batch"""
-    # Load input parameters inside the function to avoid pickling issues
-    csv_path = os.path.join(os.path.dirname(__file__), 'example_03_input.csv')
-    mc_input = pd.read_csv(csv_path).set_index('input_name').to_dict()
-    return uncertainty_functions.monte_carlo_simulation(mc_input, calculate_massflow, batch_size)
+def run_batch(batch_args):
+    """Run Monte Carlo simulation for a single batch, using the batch's own random number stream"""
+    batch_size, seed = batch_args
+    return uncertainty_functions.monte_carlo_simulation(mc_input, calculate_massflow, batch_size, vectorized=True, seed=seed, return_as_dataframe=False)
 
 if __name__ == '__main__':
     # Load input parameters from CSV file in the same folder as the script
     csv_path = os.path.join(os.path.dirname(__file__), 'example_03_input.csv')
-    mc_input = pd.read_csv(csv_path).set_index('input_name').to_dict()
+    mc_input = _read_inputs(csv_path)
     
     N = 1000000
     SEP = "="*80  # Separator line for output formatting
+    
+    # Below this number of perturbations, starting the worker processes costs more than it saves
+    PARALLEL_THRESHOLD = 100000
 
     print(SEP)
     print("BASELINE: Sequential Monte Carlo Simulation")
     print(SEP)
 
-    # Step 1: Run Monte Carlo simulation to propagate input uncertainties
+    # Step 1: Run Monte Carlo simulation to propagate input uncertainties.
+    # The mass flow calculation is evaluated once, on arrays of all N perturbations
     start_time = time.time()
-    mc_res = uncertainty_functions.monte_carlo_simulation(mc_input, calculate_massflow, N)
+    mc_res = uncertainty_functions.monte_carlo_simulation(mc_input, calculate_massflow, N, vectorized=True)
     mc_stats = uncertainty_functions.calculate_monte_carlo_statistics(mc_res)
     end_time = time.time()
     baseline_time = end_time - start_time
@@ -116,61 +163,65 @@ if __name__ == '__main__':
     print(mc_stats)
     print(f"\nBaseline Execution time: {baseline_time:.2f} seconds")
 
-    print("\n" + SEP)
-    print("PARALLEL: Batch Monte Carlo Simulation")
-    print(SEP)
-
     # Parallel processing
-    num_processes = cpu_count()  # Use all available CPU cores
+    num_processes = usable_cpu_count()  # Use all available CPU cores
 
     if num_processes>4:
         num_processes=4
 
-    batch_size = N // num_processes
-
-    print(f"\nNumber of processes: {num_processes}")
-    print(f"Batch size per process: {batch_size}")
-    print(f"Total simulations: {num_processes * batch_size}")
-
-    # Prepare arguments for parallel execution - just pass batch_size
-    batch_args = [batch_size for _ in range(num_processes)]
-
-    # Run parallel batches
-    start_time_parallel = time.time()
-    with Pool(processes=num_processes) as pool:
-        batch_results = pool.map(run_batch, batch_args)
-    end_time_parallel = time.time()
-
-    # Concatenate results
-    mc_res_parallel = pd.concat(batch_results, ignore_index=True)
-    mc_stats_parallel = uncertainty_functions.calculate_monte_carlo_statistics(mc_res_parallel)
-    parallel_time = end_time_parallel - start_time_parallel
-
-    print("\nParallel Statistics:")
-    print(mc_stats_parallel)
-    print(f"\nParallel Execution time: {parallel_time:.2f} seconds")
-
-    print("\n" + SEP)
-    print("COMPARISON")
-    print(SEP)
-    print(f"\nComparing sequential vs parallel Monte Carlo simulation:")
-    print(f"  - Total perturbations (N): {N}")
-    print(f"  - Number of parallel processes: {num_processes}")
-    print(f"  - Perturbations per process: {batch_size}")
-    print("\nPerformance Metrics:")
-    print(SEP)
-    print(f"Baseline time: {baseline_time:.2f} seconds")
-    print(f"Parallel time: {parallel_time:.2f} seconds")
-    print(f"Difference: {baseline_time - parallel_time:.2f} seconds")
-    print(f"Speedup: {baseline_time / parallel_time:.2f}x")
-    print(f"Percentage reduction in time: {(1 - parallel_time/baseline_time)*100:.1f}%")
-
-    print("\nStatistics Comparison:")
-    print(f"Baseline mean: {mc_stats.loc['qm', 'mean']:.6f}")
-    print(f"Parallel mean: {mc_stats_parallel.loc['qm', 'mean']:.6f}")
-    print(f"Difference: {abs(mc_stats.loc['qm', 'mean'] - mc_stats_parallel.loc['qm', 'mean']):.6e}")
-
-    print(f"\nBaseline std: {mc_stats.loc['qm', 'std_dev']:.6f}")
-    print(f"Parallel std: {mc_stats_parallel.loc['qm', 'std_dev']:.6f}")
-    print(f"Difference: {abs(mc_stats.loc['qm', 'std_dev'] - mc_stats_parallel.loc['qm', 'std_dev']):.6e}")
-
+    if N <= PARALLEL_THRESHOLD or num_processes < 2:
+        print(f"\nSkipping parallel simulation (N = {N}, CPU cores = {num_processes})")
+    else:
+        print("\n" + SEP)
+        print("PARALLEL: Batch Monte Carlo Simulation")
+        print(SEP)
+
+        batch_size = N // num_processes
+
+        print(f"\nNumber of processes: {num_processes}")
+        print(f"Batch size per process: {batch_size}")
+        print(f"Total simulations: {num_processes * batch_size}")
+
+        # Prepare arguments for parallel execution - batch_size and an independent child seed for each batch
+        child_seeds = np.random.SeedSequence().spawn(num_processes)
+        batch_args = [(batch_size, child_seed) for child_seed in child_seeds]
+
+        # Run parallel batches. Each worker receives the parsed input parameters once, when it starts, 
+        # so the CSV file is not parsed again by the workers
+        start_time_parallel = time.time()
+        with ProcessPoolExecutor(max_workers=num_processes, initializer=_set_inputs, initargs=(mc_input,)) as executor:
+            batch_results = list(executor.map(run_batch, batch_args))
+        end_time_parallel = time.time()
+
+        # Concatenate results. Each batch is a dictionary of arrays, so each output is joined with a single np.concatenate
+        mc_res_parallel = {key: np.concatenate([batch[key] for batch in batch_results]) for key in batch_results[0]}
+        mc_stats_parallel = uncertainty_functions.calculate_monte_carlo_statistics(mc_res_parallel)
+        parallel_time = end_time_parallel - start_time_parallel
+
+        print("\nParallel Statistics:")
+        print(mc_stats_parallel)
+        print(f"\nParallel Execution time: {parallel_time:.2f} seconds")
+
+        print("\n" + SEP)
+        print("COMPARISON")
+        print(SEP)
+        print(f"\nComparing sequential vs parallel Monte Carlo simulation:")
+        print(f"  - Total perturbations (N): {N}")
+        print(f"  - Number of parallel processes: {num_processes}")
+        print(f"  - Perturbations per process: {batch_size}")
+        print("\nPerformance Metrics:")
+        print(SEP)
+        print(f"Baseline time: {baseline_time:.2f} seconds")
+        print(f"Parallel time: {parallel_time:.2f} seconds")
+        print(f"Difference: {baseline_time - parallel_time:.2f} seconds")
+        print(f"Speedup: {baseline_time / parallel_time:.2f}x")
+        print(f"Percentage reduction in time: {(1 - parallel_time/baseline_time)*100:.1f}%")
+
+        print("\nStatistics Comparison:")
+        print(f"Baseline mean: {mc_stats.loc['qm', 'mean']:.6f}")
+        print(f"Parallel mean: {mc_stats_parallel.loc['qm', 'mean']:.6f}")
+        print(f"Difference: {abs(mc_stats.loc['qm', 'mean'] - mc_stats_parallel.loc['qm', 'mean']):.6e}")
+
+        print(f"\nBaseline std: {mc_stats.loc['qm', 'std_dev']:.6f}")
+        print(f"Parallel std: {mc_stats_parallel.loc['qm', 'std_dev']:.6f}")
+        print(f"Difference: {abs(mc_stats.loc['qm', 'std_dev'] - mc_stats_parallel.loc['qm', 'std_dev']):.6e}")
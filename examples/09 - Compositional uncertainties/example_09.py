@@ -80,6 +80,12 @@ lean_gas_conditions = {
     'temperature': 20.0  # °C
 }
 
+# Inputs that are operating conditions, not gas components
+_PT_KEYS = frozenset(('pressure', 'temperature'))
+
+# Initialize GERG-2008 equation of state once, and reuse it for all density calculations
+_GERG = pvtlib.AGA8('GERG-2008')
+
 
 def calculate_density_from_composition(input_dict):
     """
@@ -103,15 +109,12 @@ def calculate_density_from_composition(input_dict):
     """
     # Separate composition from P and T
     composition = {key: val for key, val in input_dict.items() 
-                   if key not in ['pressure', 'temperature']}
+                   if key not in _PT_KEYS}
     pressure = input_dict['pressure']
     temperature = input_dict['temperature']
     
-    # Initialize GERG-2008 equation of state
-    gerg = pvtlib.AGA8('GERG-2008')
-    
     # Calculate properties
-    properties = gerg.calculate_from_PT(
+    properties = _GERG.calculate_from_PT(
         composition=composition,
         pressure=pressure,
         temperature=temperature
@@ -172,10 +175,19 @@ def analyze_composition_uncertainty(composition, conditions, gas_name):
         }
     }
     
+    # Calculate the sensitivity coefficients of density to each input. All three methods give the same 
+    # normalized composition (mean values) and differ only in the uncertainties, so the sensitivity 
+    # coefficients are calculated once and reused for all methods, avoiding repeated GERG-2008 evaluations
+    density_sensitivities = uncertainty_functions.calculate_sensitivity_coefficients(
+        uncertainty_input_astm,
+        calculate_density_from_composition
+    )
+    
     # Calculate uncertainty in density
     density_uncertainty_astm = uncertainty_functions.calculate_uncertainty(
         uncertainty_input_astm,
-        calculate_density_from_composition
+        calculate_density_from_composition,
+        sensitivity_results=density_sensitivities
     )
     
     results['ASTM_D1945'] = {
@@ -210,7 +222,8 @@ def analyze_composition_uncertainty(composition, conditions, gas_name):
     
     density_uncertainty_norsok = uncertainty_functions.calculate_uncertainty(
         uncertainty_input_norsok,
-        calculate_density_from_composition
+        calculate_density_from_composition,
+        sensitivity_results=density_sensitivities
     )
     
     results['NORSOK_I106'] = {
@@ -248,7 +261,8 @@ def analyze_composition_uncertainty(composition, conditions, gas_name):
     
     density_uncertainty_hagenvik = uncertainty_functions.calculate_uncertainty(
         uncertainty_input_hagenvik,
-        calculate_density_from_composition
+        calculate_density_from_composition,
+        sensitivity_results=density_sensitivities
     )
     
     results['Hagenvik2024'] = {
@@ -295,7 +309,7 @@ def analyze_composition_uncertainty(composition, conditions, gas_name):
     contributions = density_uncertainty_hagenvik['contribution']['rho']
     # Filter out pressure and temperature
     comp_contributions = {k: v for k, v in contributions.items() 
-                         if k not in ['pressure', 'temperature']}
+                         if k not in _PT_KEYS}
     sorted_contributions = sorted(comp_contributions.items(), 
                                  key=lambda x: x[1], reverse=True)[:5]
     
@@ -57,7 +57,11 @@ Example of input data format. Some of the inputs are only used in Monte Carlo.
 """
 
 from uncertaintylib import uncertainty_functions
+import functools
+import os
 import numpy as np
+import pytest
+import pandas as pd
 
 
 def _calculate_volume(inputs):
@@ -196,6 +200,31 @@ def test_calculate_uncertainty_04():
     assert round(result['U_perc']['MassFlow'],2) == 0.55, 'Error in orifice mass flow rate standard uncertainty'
 
 
+@functools.cache
+def _get_gerg():
+    # Only run once, as it is time consuming
+    import pvtlib
+    return pvtlib.AGA8('GERG-2008')
+
+
+@functools.lru_cache(maxsize=4096)
+def _gerg_properties(composition, pressure, temperature):
+    """
+    Returns density and molecular weight over compressibility from GERG-2008, for a composition given as a tuple of (component, value) pairs.
+    Cached, so that evaluations where only inputs not used by GERG-2008 change (such as the volumetric flowrate) are not recalculated.
+    """
+    gas_properties = _get_gerg().calculate_from_PT(
+        composition=dict(composition),
+        pressure=pressure,
+        temperature=temperature,
+    )
+
+    return gas_properties['rho'], gas_properties['mm']/gas_properties['z']
+
+
+_COMPOSITION_KEYS = ('N2', 'CO2', 'C1', 'C2', 'C3', 'iC4', 'nC4', 'iC5', 'nC5', 'C6')
+
+
 def _usm_metering_station(inputs):
     """
     Calculates gas properties and mass flowrate for a USM (Ultrasonic Flow Meter) 
@@ -211,41 +240,13 @@ def _usm_metering_station(inputs):
 
     outputs = {}
 
-    if not hasattr(_usm_metering_station, "_cached_data"):
-        
-        # Only run once, as it is time consuming
-        import pvtlib
-        gerg = pvtlib.AGA8('GERG-2008')
-
-        _usm_metering_station._cached_data = gerg
-
-    gerg = _usm_metering_station._cached_data
-
-    # Set up composition
-    composition = {
-        'N2' : inputs['N2'],
-        'CO2' : inputs['CO2'],
-        'C1' : inputs['C1'],
-        'C2' : inputs['C2'],
-        'C3' : inputs['C3'],
-        'iC4' : inputs['iC4'],
-        'nC4' : inputs['nC4'],
-        'iC5' : inputs['iC5'],
-        'nC5' : inputs['nC5'],
-        'C6' : inputs['C6'],
-    }
-
-    # Calculate gas properties
-    gas_properties = gerg.calculate_from_PT(
-        composition=composition,
-        pressure=inputs['pressure_bara'],
-        temperature=inputs['temperature_C'],
+    # Calculate gas properties. The composition is passed as a tuple of (component, fraction) pairs
+    outputs['rho'], outputs['m/Z'] = _gerg_properties(
+        tuple((component, inputs[component]) for component in _COMPOSITION_KEYS),
+        inputs['pressure_bara'],
+        inputs['temperature_C'],
     )
 
-    # Get selected gas properties
-    outputs['rho'] = gas_properties['rho']
-    outputs['m/Z'] = gas_properties['mm']/gas_properties['z']
-
     # Calculate mass flowrate from ultrasonic flowmeter
     outputs['Qm'] = outputs['rho'] * inputs['Qv'] # kg/h
 
@@ -333,7 +334,7 @@ def test_calculate_uncertainty_05():
     )
 
     # Print comparison results
-    if True:
+    if os.environ.get("UNC_VERBOSE") == "1":
         print(comparison)
 
     # Target uncertainties from NFOGM Fiscal Gas Metering Station Uncertainty (GasMet) tool
@@ -355,3 +356,366 @@ def test_calculate_uncertainty_05():
         assert target - CRITERIA_CONVENTIONAL <= conventional <= target + CRITERIA_CONVENTIONAL, f"Conventional uncertainty for {key} is out of bounds: {conventional}"
         assert target - CRITERIA_MONTE_CARLO <= monte_carlo <= target + CRITERIA_MONTE_CARLO, f"Monte Carlo uncertainty for {key} is out of bounds: {monte_carlo}"
 
+
+
+@pytest.fixture
+def volume_data():
+    # Input data for _calculate_volume, shared by the Monte Carlo tests
+    return {
+        "mean": {
+            "L": 2.0,
+            "W": 2.0,
+            "D": 2.0
+        },
+        "standard_uncertainty": {
+            "L": 0.3,
+            "W": 0.1,
+            "D": 0.2
+        }
+    }
+
+
+def test_monte_carlo_simulation_vectorized(volume_data):
+    # Test that a vectorized Monte Carlo simulation (one function call on arrays) gives the same results as a sample-by-sample simulation
+    data = volume_data
+
+    # Use the same seed, so that both simulations use identical input samples
+    mc_res = uncertainty_functions.monte_carlo_simulation(data, _calculate_volume, 20000, seed=1)
+    mc_res_vectorized = uncertainty_functions.monte_carlo_simulation(data, _calculate_volume, 20000, vectorized=True, seed=1)
+
+    for key in ['volume', 'area']:
+        assert np.allclose(mc_res_vectorized[key], mc_res[key]), f'Error in vectorized Monte Carlo results for {key}'
+
+
+def test_monte_carlo_simulation_seed(volume_data):
+    # Test that Monte Carlo simulations are reproducible when a seed is given
+    data = {**volume_data, "min": {"L": 1.8, "W": np.nan, "D": np.nan}}
+
+    mc_res_1 = uncertainty_functions.monte_carlo_simulation(data, _calculate_volume, 1000, seed=42)
+    mc_res_2 = uncertainty_functions.monte_carlo_simulation(data, _calculate_volume, 1000, seed=42)
+    mc_res_3 = uncertainty_functions.monte_carlo_simulation(data, _calculate_volume, 1000, seed=43)
+
+    assert mc_res_1.equals(mc_res_2), 'Monte Carlo results with the same seed should be identical'
+    assert not mc_res_1.equals(mc_res_3), 'Monte Carlo results with different seeds should differ'
+
+
+def test_calculate_uncertainty_sensitivity_results():
+    # Test that precomputed sensitivity coefficients give the same result as calculating them
+    data = {
+        "mean": {
+            "L": 2.0,
+            "W": 3.0,
+            "D": 4.0
+        },
+        "standard_uncertainty": {
+            "L": 0.1,
+            "W": 0.2,
+            "D": 0.3
+        }
+    }
+
+    sensitivities = uncertainty_functions.calculate_sensitivity_coefficients(data, _calculate_volume)
+    res_1 = uncertainty_functions.calculate_uncertainty(data, _calculate_volume)
+    res_2 = uncertainty_functions.calculate_uncertainty(data, _calculate_volume, sensitivity_results=sensitivities)
+
+    assert res_1['U'] == res_2['U']
+    assert res_1['contribution'] == res_2['contribution']
+
+
+def test_monte_carlo_simulation_normal_samples():
+    # Test that the normal distributed input samples have the given mean and standard deviation, and respect boundaries
+    data = {
+        "mean": {
+            "A": 10.0,
+            "B": -5.0,
+            "C": 1.0
+        },
+        "standard_uncertainty": {
+            "A": 0.5,
+            "B": 2.0,
+            "C": 0.1
+        },
+        "min": {
+            "A": np.nan,
+            "B": np.nan,
+            "C": 0.95
+        }
+    }
+
+    mc_res = uncertainty_functions.monte_carlo_simulation(data, lambda inputs: dict(inputs), 100000, vectorized=True, seed=1)
+
+    assert np.isclose(mc_res['A'].mean(), 10.0, atol=0.01)
+    assert np.isclose(mc_res['A'].std(), 0.5, rtol=0.01)
+    assert np.isclose(mc_res['B'].mean(), -5.0, atol=0.04)
+    assert np.isclose(mc_res['B'].std(), 2.0, rtol=0.01)
+    assert np.corrcoef(mc_res['A'], mc_res['B'])[0, 1] < 0.01
+    assert mc_res['C'].min() >= 0.95
+
+
+def test_calculate_sensitivity_coefficients_baseline_results():
+    # Test that a provided baseline result is used instead of evaluating the function for the mean values
+    data = {
+        "mean": {
+            "L": 2.0,
+            "W": 3.0,
+            "D": 4.0
+        },
+        "standard_uncertainty": {
+            "L": 0.1,
+            "W": 0.2,
+            "D": 0.3
+        }
+    }
+
+    calls = []
+    def counting_volume(input_dict):
+        calls.append(input_dict)
+        return _calculate_volume(input_dict)
+
+    baseline = _calculate_volume(data['mean'])
+    res_1 = uncertainty_functions.calculate_sensitivity_coefficients(data, _calculate_volume)
+    res_2 = uncertainty_functions.calculate_sensitivity_coefficients(data, counting_volume, baseline_results=baseline)
+
+    assert len(calls) == len(data['mean'])
+    assert res_1 == res_2
+
+
+def test_monte_carlo_simulation_samples(volume_data):
+    # Test that input samples from sample_perturbations can be shared between Monte Carlo simulations
+    data = volume_data
+
+    samples = uncertainty_functions.sample_perturbations(data, 1000, seed=42)
+
+    assert list(samples) == ['L', 'W', 'D']
+    assert all(len(val) == 1000 for val in samples.values())
+
+    mc_res_1 = uncertainty_functions.monte_carlo_simulation(data, _calculate_volume, 1000, seed=42)
+    mc_res_2 = uncertainty_functions.monte_carlo_simulation(data, _calculate_volume, 1000, samples=samples)
+    mc_res_3 = uncertainty_functions.monte_carlo_simulation(data, _calculate_volume, 1000, vectorized=True, samples=samples)
+
+    assert mc_res_1.equals(mc_res_2)
+    assert np.allclose(mc_res_2['volume'], mc_res_3['volume'])
+
+
+def test_monte_carlo_output_correlations():
+    # Test the correlation coefficients between Monte Carlo outputs against numpy
+    rng = np.random.default_rng(1)
+    x = rng.standard_normal(1000)
+    y = rng.standard_normal(1000)
+    outputs = pd.DataFrame({'x': x, 'y': y, 'z': 2*x + y})
+
+    correlations = uncertainty_functions.monte_carlo_output_correlations(outputs, return_as_dataframe=True)
+    correlations_dict = uncertainty_functions.monte_carlo_output_correlations(outputs)
+
+    assert np.isclose(correlations.loc['x', 'z'], np.corrcoef(x, 2*x + y)[0, 1])
+    assert correlations.loc['z', 'x'] == correlations.loc['x', 'z']
+    assert np.isnan(correlations.loc['x', 'x'])
+    assert list(correlations_dict) == ['x and y', 'x and z', 'y and z']
+    assert correlations_dict['y and z'] == correlations.loc['y', 'z']
+
+
+def test_monte_carlo_simulation_return_as_dict(volume_data):
+    # Test that Monte Carlo results returned as a dictionary of arrays give the same statistics as the DataFrame
+    data = volume_data
+
+    mc_res_df = uncertainty_functions.monte_carlo_simulation(data, _calculate_volume, 1000, seed=42)
+    mc_res_dict = uncertainty_functions.monte_carlo_simulation(data, _calculate_volume, 1000, seed=42, return_as_dataframe=False)
+
+    assert isinstance(mc_res_dict, dict)
+    assert isinstance(mc_res_dict['volume'], np.ndarray)
+
+    stats_df = uncertainty_functions.calculate_monte_carlo_statistics(mc_res_df)
+    stats_dict = uncertainty_functions.calculate_monte_carlo_statistics(mc_res_dict)
+
+    assert np.isclose(stats_df.loc['volume', 'mean'], mc_res_df['volume'].mean())
+    assert np.isclose(stats_df.loc['volume', 'std_dev'], mc_res_df['volume'].std())
+    assert stats_df.equals(stats_dict)
+    assert uncertainty_functions.monte_carlo_output_correlations(mc_res_df) == uncertainty_functions.monte_carlo_output_correlations(mc_res_dict)
+
+
+def test_monte_carlo_simulation_sampling_methods(volume_data):
+    # Test Latin hypercube and Sobol sampling of normal distributed inputs, with and without boundaries
+    data = {**volume_data, "min": {"L": 1.8, "W": np.nan, "D": np.nan}}
+
+    for sampling_method in ['lhs', 'sobol']:
+        samples = uncertainty_functions.sample_perturbations(data, 2**12, seed=1, sampling_method=sampling_method)
+
+        assert samples['L'].min() >= 1.8
+        assert np.isclose(samples['W'].mean(), 2.0, atol=1e-3)
+        assert np.isclose(samples['W'].std(), 0.1, rtol=1e-2)
+
+        mc_res = uncertainty_functions.monte_carlo_simulation(data, _calculate_volume, 2**12, vectorized=True, seed=1, sampling_method=sampling_method)
+        assert np.allclose(mc_res['volume'], _calculate_volume(samples)['volume'])
+
+    with pytest.raises(ValueError):
+        uncertainty_functions.sample_perturbations(data, 100, sampling_method='halton')
+
+
+def test_monte_carlo_simulation_max_workers(volume_data):
+    # Test that a Monte Carlo simulation evaluated in worker processes gives the same results as in the calling process
+    data = volume_data
+
+    mc_res = uncertainty_functions.monte_carlo_simulation(data, _calculate_volume, 1000, seed=42)
+    mc_res_parallel = uncertainty_functions.monte_carlo_simulation(data, _calculate_volume, 1000, seed=42, max_workers=2)
+
+    assert mc_res.equals(mc_res_parallel)
+
+
+def test_sample_perturbations_missing_boundaries():
+    # Test that minimum and maximum values given as None or nan are treated as no boundary
+    data = {
+        "mean": {"L": 2.0, "W": 2.0},
+        "standard_uncertainty": {"L": 0.3, "W": 0.1},
+        "min": {"L": None, "W": 1.9},
+        "max": {"L": np.nan, "W": None},
+    }
+
+    samples = uncertainty_functions.sample_perturbations(data, 1000, seed=1)
+
+    assert samples['L'].min() < 1.5
+    assert samples['W'].min() >= 1.9
+    assert samples['W'].max() > 2.1
+
+
+def test_calculate_sensitivity_coefficients_vectorized(volume_data):
+    # Test that sensitivity coefficients calculated with a single vectorized function call equals the ones calculated per input
+    data = {
+        **volume_data,
+        "mean": {**volume_data["mean"], "W": 0.0},
+        "distribution": {"L": "normal", "W": "normal", "D": "none"}
+    }
+
+    sensitivities = uncertainty_functions.calculate_sensitivity_coefficients(data, _calculate_volume)
+    sensitivities_vectorized = uncertainty_functions.calculate_sensitivity_coefficients(data, _calculate_volume, vectorized=True)
+
+    for key in ['absolute_sensitivity_coefficients', 'relative_sensitivity_coefficients']:
+        assert list(sensitivities_vectorized[key]) == list(data['mean'])
+        for input_var, coefficients in sensitivities[key].items():
+            for output, value in coefficients.items():
+                np.testing.assert_allclose(sensitivities_vectorized[key][input_var][output], value)
+
+
+def test_monte_carlo_simulation_non_float_outputs(volume_data):
+    # Test that integer, boolean and string outputs keep their type in a sample-by-sample Monte Carlo simulation
+    def classify_volume(inputs):
+        volume = _calculate_volume(inputs)['volume']
+        return {'volume': volume, 'count': int(volume > 8.0), 'large': volume > 8.0, 'label': 'large' if volume > 8.0 else 'small'}
+
+    mc_res = uncertainty_functions.monte_carlo_simulation(volume_data, classify_volume, 100, seed=42)
+
+    assert mc_res['volume'].dtype == np.float64
+    assert mc_res['count'].dtype == np.int64
+    assert mc_res['large'].dtype == bool
+    assert set(mc_res['label']) == {'large', 'small'}
+    assert (mc_res['count'] == mc_res['large']).all()
+    assert ((mc_res['label'] == 'large') == mc_res['large']).all()
+
+
+def test_calculate_sensitivity_coefficients_independent_inputs(volume_data):
+    # Test that each function call gets its own input dictionary, so that a function keeping its inputs is not affected
+    received_inputs = []
+    def storing_volume(input_dict):
+        received_inputs.append(input_dict)
+        return _calculate_volume(input_dict)
+
+    uncertainty_functions.calculate_sensitivity_coefficients(volume_data, storing_volume)
+
+    assert len({id(input_dict) for input_dict in received_inputs}) == len(received_inputs)
+    for input_dict, input_var in zip(received_inputs[1:], volume_data['mean']):
+        assert input_dict[input_var] == pytest.approx(volume_data['mean'][input_var]*1.01)
+        assert all(input_dict[other] == value for other, value in volume_data['mean'].items() if other != input_var)
+
+
+def test_sample_perturbations_seed(volume_data):
+    # Test that samples are reproducible with the seed argument, and that the global NumPy seed has no effect
+    samples_1 = uncertainty_functions.sample_perturbations(volume_data, 1000, seed=42)
+    samples_2 = uncertainty_functions.sample_perturbations(volume_data, 1000, seed=42)
+
+    for input_var in volume_data['mean']:
+        np.testing.assert_array_equal(samples_1[input_var], samples_2[input_var])
+
+    np.random.seed(42)
+    samples_3 = uncertainty_functions.sample_perturbations(volume_data, 1000)
+    np.random.seed(42)
+    samples_4 = uncertainty_functions.sample_perturbations(volume_data, 1000)
+
+    assert not np.array_equal(samples_3['L'], samples_4['L'])
+
+
+def test_monte_carlo_simulation_float32(volume_data):
+    # Test that samples can be generated as float32, with the same statistics as float64 samples
+    data = {
+        **volume_data,
+        "distribution": {"L": "normal", "W": "uniform", "D": "none"},
+        "min": {"L": 1.8, "W": 1.9, "D": np.nan},
+        "max": {"L": np.nan, "W": 2.1, "D": np.nan}
+    }
+
+    for sampling_method in ['random', 'lhs']:
+        samples = uncertainty_functions.sample_perturbations(data, 2**14, seed=1, dtype=np.float32, sampling_method=sampling_method)
+        assert samples['L'].dtype == np.float32
+        assert samples['W'].dtype == np.float32
+        assert samples['D'].dtype == np.float64
+
+    mc_res_64 = uncertainty_functions.monte_carlo_simulation(data, _calculate_volume, 2**14, vectorized=True, seed=1)
+    mc_res_32 = uncertainty_functions.monte_carlo_simulation(data, _calculate_volume, 2**14, vectorized=True, seed=1, dtype=np.float32)
+
+    stats_64 = uncertainty_functions.calculate_monte_carlo_statistics(mc_res_64)
+    stats_32 = uncertainty_functions.calculate_monte_carlo_statistics(mc_res_32)
+    for statistic in ['mean', 'std_dev']:
+        assert np.isclose(stats_32.loc['volume', statistic], stats_64.loc['volume', statistic], rtol=0.02)
+
+
+def test_monte_carlo_simulation_integer_setting(volume_data):
+    # Test that integer settings (distribution 'none' or zero standard uncertainty) are passed to the function as integers
+    data = {
+        "mean": {**volume_data["mean"], "s": 1, "t": 0},
+        "standard_uncertainty": {**volume_data["standard_uncertainty"], "s": 0.5, "t": 0.0},
+        "distribution": {"L": "normal", "W": "normal", "D": "normal", "s": "none", "t": "normal"}
+    }
+    def scaled_volume(inputs):
+        return {'volume': [10, 20][inputs['s']]*[1, 2][inputs['t']]*_calculate_volume(inputs)['volume']}
+
+    samples = uncertainty_functions.sample_perturbations(data, 100, seed=1)
+    samples_32 = uncertainty_functions.sample_perturbations(data, 100, seed=1, dtype=np.float32)
+    for input_var in ['s', 't']:
+        assert np.issubdtype(samples[input_var].dtype, np.integer)
+        assert np.issubdtype(samples_32[input_var].dtype, np.integer)
+
+    mc_res = uncertainty_functions.monte_carlo_simulation(data, scaled_volume, 100, seed=1)
+    # Sensitivity coefficients are only skipped for inputs with distribution 'none'
+    sensitivities = uncertainty_functions.calculate_sensitivity_coefficients(
+        {**data, "distribution": {**data["distribution"], "t": "none"}}, scaled_volume
+    )
+
+    assert np.allclose(mc_res['volume'], 20*_calculate_volume(samples)['volume'], rtol=1e-6)
+    assert sensitivities['baseline_results']['volume'] == 20*8.0
+
+
+def test_monte_carlo_simulation_mixed_outputs(volume_data):
+    # Test that an output returning both floats and strings is returned as an object column, as pd.DataFrame would
+    def classify_volume(inputs):
+        volume = _calculate_volume(inputs)['volume']
+        return {'volume': volume, 'large_volume': volume if volume > 8.0 else 'small'}
+
+    mc_res = uncertainty_functions.monte_carlo_simulation(volume_data, classify_volume, 100, seed=42)
+    mc_res_reference = pd.DataFrame([
+        classify_volume(inputs) for inputs in pd.DataFrame(uncertainty_functions.sample_perturbations(volume_data, 100, seed=42)).to_dict('records')
+    ])
+
+    assert mc_res['large_volume'].dtype == object
+    assert mc_res['large_volume'].iloc[0] != 'small'
+    assert 'small' in set(mc_res['large_volume'])
+    assert mc_res['large_volume'].tolist() == mc_res_reference['large_volume'].tolist()
+
+
+def test_sample_perturbations_quasi_random_invalid_boundaries(volume_data):
+    # Test that Latin hypercube and Sobol sampling raise an error instead of giving inf or nan samples
+    uniform_without_max = {**volume_data, "distribution": {"L": "uniform", "W": "normal", "D": "normal"}, "min": {"L": 1.0}}
+    normal_far_in_tail = {**volume_data, "min": {"L": 100.0}, "max": {"L": 200.0}}
+
+    for sampling_method in ['lhs', 'sobol']:
+        with pytest.raises(ValueError, match="finite minimum and maximum"):
+            uncertainty_functions.sample_perturbations(uniform_without_max, 64, seed=1, sampling_method=sampling_method)
+        with pytest.raises(ValueError, match="too far out in the tail"):
+            uncertainty_functions.sample_perturbations(normal_far_in_tail, 64, seed=1, sampling_method=sampling_method)
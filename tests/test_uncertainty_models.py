@@ -21,702 +21,221 @@ OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 SOFTWARE.
 """
 
-import sys
 import os
 
-from uncertaintylib.uncertainty_models import gas_composition
-
-
-def test_norsok_i106_nfogm_reference_case1():
-    """
-    Test NORSOK I-106 method against NFOGM reference data.
-    
-    Composition and expected uncertainties from NFOGM Fiscal Gas 
-    Metering Station Uncertainty app. The uncertainties are 
-    expanded uncertainties at 95% confidence level (k=2).
-    """
-    # Test composition (mole percent)
-    composition = {
-        'C1': 86.3,
-        'C2': 6.01,
-        'C3': 3.0,
-        'iC4': 1.1,
-        'nC4': 0.9,
-        'iC5': 0.35,
-        'nC5': 0.35,
-        'N2': 1.0,
-        'CO2': 1.0
-    }
-    
-    # Expected expanded uncertainties (k=2) from NFOGM Fiscal Gas Metering Station Uncertainty (GasMet) tool (mol%)
-    expected_expanded_uncertainty = {
-        'C1': 0.724,
-        'C2': 0.0966,
-        'C3': 0.0659,
-        'iC4': 0.05,
-        'nC4': 0.05,
-        'iC5': 0.0403,
-        'nC5': 0.0403,
-        'N2': 0.104,
-        'CO2': 0.066
-    }
-    
-    # Expected relative uncertainties (k=2) from NFOGM Fiscal Gas Metering Station Uncertainty (GasMet) tool (%)
-    expected_relative_uncertainty = {
-        'C1': 0.839,
-        'C2': 1.61,
-        'C3': 2.2,
-        'iC4': 4.54,
-        'nC4': 5.55,
-        'iC5': 11.5,
-        'nC5': 11.5,
-        'N2': 10.4,
-        'CO2': 6.6
-    }
-    
-    # Calculate uncertainties using NORSOK I-106 method
-    result = gas_composition.component_uncertainty_from_norsok_I106(composition)
-    
-    # Check that composition is normalized to 100%
-    total_composition = sum(result['mean'].values())
-    assert abs(total_composition - 100.0) < 1e-10, "Composition should be normalized to 100%"
-    
-    print("\nNORSOK I-106 Test Results:")
-    print("="*110)
-    print(f"{'Comp':<6} {'Conc':<8} {'Expected':<12} {'Calc':<12} {'Error':<10} {'Status':<8} "
-          f"{'Expected':<12} {'Calc':<12} {'Error':<10} {'Status'}")
-    print(f"{'':6} {'mol%':<8} {'U(k=2)':<12} {'U(k=2)':<12} {'mol%':<10} {'abs':<8} "
-          f"{'U%(k=2)':<12} {'U%(k=2)':<12} {'%':<10} {'rel'}")
-    print("-"*110)
-    
-    # Check each component's expanded uncertainty (k=2) - both absolute and relative
-    all_passed = True
-    for component in expected_expanded_uncertainty.keys():
-        calculated_standard_unc = result['standard_uncertainty'][component]
-        calculated_expanded_unc = calculated_standard_unc * 2  # Convert k=1 to k=2
-        expected_expanded_unc = expected_expanded_uncertainty[component]
-        
-        # Calculate relative uncertainties (as percentage of concentration)
-        component_conc = result['mean'][component]
-        if component_conc > 0:
-            calculated_relative_unc = (calculated_expanded_unc / component_conc) * 100
-        else:
-            calculated_relative_unc = 0.0
-        expected_relative_unc = expected_relative_uncertainty[component]
-        
-        # Calculate absolute errors
-        abs_error = abs(calculated_expanded_unc - expected_expanded_unc)
-        rel_error = abs(calculated_relative_unc - expected_relative_unc)
-        
-        # Tolerance: 0.01 mol% for absolute uncertainty, 0.5% for relative uncertainty
-        abs_status = "PASS" if abs_error < 0.01 else "FAIL"
-        rel_status = "PASS" if rel_error < 0.5 else "FAIL"
-        
-        if abs_status == "FAIL" or rel_status == "FAIL":
-            all_passed = False
-        
-        print(f"{component:<6} {component_conc:<8.2f} {expected_expanded_unc:<12.4f} "
-              f"{calculated_expanded_unc:<12.4f} {abs_error:<10.4f} {abs_status:<8} "
-              f"{expected_relative_unc:<12.2f} {calculated_relative_unc:<12.2f} "
-              f"{rel_error:<10.2f} {rel_status}")
-    
-    print("-"*110)
-    print(f"Overall: {'ALL TESTS PASSED' if all_passed else 'SOME TESTS FAILED'}")
-    print("="*110)
-    
-    assert all_passed, "Some component uncertainties did not match NFOGM reference within tolerance"
-
-
-def test_norsok_i106_nfogm_reference_case2():
-    """
-    Test NORSOK I-106 method against NFOGM reference data (case 2).
-    
-    Equal mole percent composition to test mass-based factor determination.
-    Composition and expected uncertainties from NFOGM Fiscal Gas 
-    Metering Station Uncertainty app. The uncertainties are 
-    expanded uncertainties at 95% confidence level (k=2).
-    """
-    # Test composition (mole percent) - equal mole percentages
-    composition = {
-        'C1': 25.0,
-        'C2': 25.0,
-        'C3': 25.0,
-        'iC4': 25.0
-    }
-    
-    # Expected expanded uncertainties (k=2) from NFOGM Fiscal Gas Metering Station Uncertainty (GasMet) tool (mol%)
-    expected_expanded_uncertainty = {
-        'C1': 0.347,
-        'C2': 0.370,
-        'C3': 0.252,
-        'iC4': 0.191
-    }
-    
-    # Expected relative uncertainties (k=2) from NFOGM Fiscal Gas Metering Station Uncertainty (GasMet) tool (%)
-    expected_relative_uncertainty = {
-        'C1': 1.39,
-        'C2': 1.48,
-        'C3': 1.01,
-        'iC4': 0.766
-    }
-    
-    # Calculate uncertainties using NORSOK I-106 method
-    result = gas_composition.component_uncertainty_from_norsok_I106(composition)
-    
-    # Check that composition is normalized to 100%
-    total_composition = sum(result['mean'].values())
-    assert abs(total_composition - 100.0) < 1e-10, "Composition should be normalized to 100%"
-    
-    print("\nNORSOK I-106 Test Results (Case 2 - Equal Mole %):")
-    print("="*110)
-    print(f"{'Comp':<6} {'Conc':<8} {'Expected':<12} {'Calc':<12} {'Error':<10} {'Status':<8} "
-          f"{'Expected':<12} {'Calc':<12} {'Error':<10} {'Status'}")
-    print(f"{'':6} {'mol%':<8} {'U(k=2)':<12} {'U(k=2)':<12} {'mol%':<10} {'abs':<8} "
-          f"{'U%(k=2)':<12} {'U%(k=2)':<12} {'%':<10} {'rel'}")
-    print("-"*110)
-    
-    # Check each component's expanded uncertainty (k=2) - both absolute and relative
-    all_passed = True
-    for component in expected_expanded_uncertainty.keys():
-        calculated_standard_unc = result['standard_uncertainty'][component]
-        calculated_expanded_unc = calculated_standard_unc * 2  # Convert k=1 to k=2
-        expected_expanded_unc = expected_expanded_uncertainty[component]
-        
-        # Calculate relative uncertainties (as percentage of concentration)
-        component_conc = result['mean'][component]
-        if component_conc > 0:
-            calculated_relative_unc = (calculated_expanded_unc / component_conc) * 100
-        else:
-            calculated_relative_unc = 0.0
-        expected_relative_unc = expected_relative_uncertainty[component]
-        
-        # Calculate absolute errors
-        abs_error = abs(calculated_expanded_unc - expected_expanded_unc)
-        rel_error = abs(calculated_relative_unc - expected_relative_unc)
-        
-        # Tolerance: 0.01 mol% for absolute uncertainty, 0.5% for relative uncertainty
-        abs_status = "PASS" if abs_error < 0.01 else "FAIL"
-        rel_status = "PASS" if rel_error < 0.5 else "FAIL"
-        
-        if abs_status == "FAIL" or rel_status == "FAIL":
-            all_passed = False
-        
-        print(f"{component:<6} {component_conc:<8.2f} {expected_expanded_unc:<12.4f} "
-              f"{calculated_expanded_unc:<12.4f} {abs_error:<10.4f} {abs_status:<8} "
-              f"{expected_relative_unc:<12.2f} {calculated_relative_unc:<12.2f} "
-              f"{rel_error:<10.2f} {rel_status}")
-    
-    print("-"*110)
-    print(f"Overall: {'ALL TESTS PASSED' if all_passed else 'SOME TESTS FAILED'}")
-    print("="*110)
-    
-    assert all_passed, "Some component uncertainties did not match NFOGM reference within tolerance"
-
-
-def test_norsok_i106_nfogm_reference_case3():
+import numpy as np
+import pandas as pd
+import pytest
+
+from uncertaintylib.uncertainty_models.gas_composition import (
+    component_uncertainty_from_ASTM_D1945 as astm_d1945,
+    component_uncertainty_from_ASTM_D1945_array as astm_d1945_array,
+    component_uncertainty_from_norsok_I106 as norsok_i106,
+    component_uncertainty_from_norsok_I106_array as norsok_i106_array,
+    component_uncertainty_from_haagenvik2024 as hagenvik2024,
+    component_uncertainty_from_haagenvik2024_array as hagenvik2024_array,
+)
+
+# Set the environment variable UNC_VERBOSE=1 to print the comparison tables (use together with pytest -s)
+_VERBOSE = os.environ.get("UNC_VERBOSE") == "1"
+
+
+def _from_arrays(method_array):
+    # Adapter that evaluates the array variant of a method, with the composition given as a dictionary
+    def method(composition):
+        return method_array(tuple(composition), np.fromiter(composition.values(), dtype=np.float64))
+    return method
+
+
+# Hydrocarbon part of the NFOGM reference composition (mol%), shared by the NORSOK I-106 and ASTM D1945 case 1, 
+# which only differ in N2 and CO2
+_NFOGM_CASE1_HYDROCARBONS = {'C1': 86.3, 'C2': 6.01, 'C3': 3.0, 'iC4': 1.1, 'nC4': 0.9, 'iC5': 0.35, 'nC5': 0.35}
+
+
+# Reference cases: (method, composition (mol%), expected expanded uncertainties (k=2, mol%), expected relative expanded 
+# uncertainties (k=2, %), label). The expected uncertainties are arrays in the same component order as the composition. 
+# Unless stated otherwise, the expected uncertainties are from the NFOGM Fiscal Gas Metering Station Uncertainty (GasMet) 
+# tool (https://gasmetapp.web.norce.cloud/)
+CASES = [
+    pytest.param(
+        norsok_i106,
+        {**_NFOGM_CASE1_HYDROCARBONS, 'N2': 1.0, 'CO2': 1.0},
+        np.array([0.724, 0.0966, 0.0659, 0.05, 0.05, 0.0403, 0.0403, 0.104, 0.066]),
+        np.array([0.839, 1.61, 2.2, 4.54, 5.55, 11.5, 11.5, 10.4, 6.6]),
+        "NORSOK I-106",
+        id="norsok_i106_case1",
+    ),
+    pytest.param(
+        # Equal mole percent composition to test mass-based factor determination
+        norsok_i106,
+        {'C1': 25.0, 'C2': 25.0, 'C3': 25.0, 'iC4': 25.0},
+        np.array([0.347, 0.370, 0.252, 0.191]),
+        np.array([1.39, 1.48, 1.01, 0.766]),
+        "NORSOK I-106 (Case 2 - Equal Mole %)",
+        id="norsok_i106_case2",
+    ),
+    pytest.param(
+        # Equal 10% mole percent composition across C1-C8 to test mass-based factor determination for heavier components
+        norsok_i106,
+        {'C1': 10.0, 'C2': 10.0, 'C3': 10.0, 'iC4': 10.0, 'nC4': 10.0, 'iC5': 10.0, 'nC5': 10.0, 'nC6': 10.0, 'nC7': 10.0, 'nC8': 10.0},
+        np.array([0.609, 0.325, 0.222, 0.168, 0.168, 0.135, 0.135, 0.113, 0.0975, 0.0855]),
+        np.array([6.09, 3.25, 2.22, 1.68, 1.68, 1.35, 1.35, 1.13, 0.975, 0.855]),
+        "NORSOK I-106 (Case 3 - Equal 10% Mole %, C1-C8)",
+        id="norsok_i106_case3",
+    ),
+    pytest.param(
+        astm_d1945,
+        {**_NFOGM_CASE1_HYDROCARBONS, 'N2': 0.9, 'CO2': 1.1},
+        np.array([0.15, 0.12, 0.1, 0.1, 0.07, 0.07, 0.07, 0.07, 0.1]),
+        np.array([0.174, 2.0, 3.33, 9.09, 7.78, 20.0, 20.0, 7.78, 9.09]),
+        "ASTM D1945",
+        id="astm_d1945_case1",
+    ),
+    pytest.param(
+        # Composition with varying concentrations across different ASTM ranges
+        astm_d1945,
+        {'C1': 60.0, 'C2': 20.0, 'C3': 10.0, 'iC4': 5.0, 'nC4': 5.0},
+        np.array([0.15, 0.15, 0.15, 0.12, 0.12]),
+        np.array([0.25, 0.75, 1.5, 2.4, 2.4]),
+        "ASTM D1945 (Case 2)",
+        id="astm_d1945_case2",
+    ),
+    pytest.param(
+        # Based on calculations from the Hagenvik 2024 publication, not verified against the GasMet tool as this method is not available there
+        hagenvik2024,
+        {'N2': 1.0, 'CO2': 2.0, 'C1': 85.0, 'C2': 5.0, 'C3': 3.0, 'iC4': 1.0, 'nC4': 1.0, 'iC5': 0.5, 'nC5': 0.5, 'nC6': 1.0},
+        np.array([0.0680, 0.0371, 0.0000, 0.0678, 0.1451, 0.0360, 0.0540, 0.0245, 0.0332, 0.2060]),
+        np.array([6.80, 1.855, 0.000, 1.356, 4.837, 3.60, 5.40, 4.90, 6.64, 20.60]),
+        "Hagenvik 2024",
+        id="hagenvik2024_case1",
+    ),
+    pytest.param(
+        # Based on calculations from the Hagenvik 2024 publication, not verified against the GasMet tool as this method is not available there
+        hagenvik2024,
+        {'N2': 3.0, 'CO2': 4.0, 'C1': 87.0, 'C2': 2.0, 'C3': 1.0, 'iC4': 1.0, 'nC4': 1.0, 'iC5': 0.25, 'nC5': 0.25, 'nC6': 0.5},
+        np.array([0.2051, 0.0530, 0.0000, 0.0756, 0.0500, 0.0360, 0.0540, 0.0188, 0.0240, 0.1283]),
+        np.array([6.837, 1.325, 0.000, 3.78, 5.00, 3.60, 5.40, 7.52, 9.60, 25.66]),
+        "Hagenvik 2024 (Case 2)",
+        id="hagenvik2024_case2",
+    ),
+]
+
+# The same reference cases evaluated with the array variant of each method
+_ARRAY_METHODS = {astm_d1945: astm_d1945_array, norsok_i106: norsok_i106_array, hagenvik2024: hagenvik2024_array}
+CASES += [
+    pytest.param(_from_arrays(_ARRAY_METHODS[case.values[0]]), *case.values[1:], id=f"{case.id}_array")
+    for case in CASES
+]
+
+
+def _check(result, components, expected_expanded_unc, expected_relative_unc, label):
     """
-    Test NORSOK I-106 method against NFOGM reference data (case 3).
-    
-    Equal 10% mole percent composition across C1-C8 to test mass-based factor 
-    determination for heavier components. Composition and expected uncertainties 
-    from NFOGM Fiscal Gas Metering Station Uncertainty (GasMet) tool. The uncertainties 
-    are expanded uncertainties at 95% confidence level (k=2).
+    Compares calculated expanded uncertainties (k=2), both absolute and relative, against reference values aligned with components. 
+    The result can hold the mean and standard uncertainty either as dictionaries or as arrays aligned with components.
     """
-    # Test composition (mole percent) - equal 10% for all components
-    composition = {
-        'C1': 10.0,
-        'C2': 10.0,
-        'C3': 10.0,
-        'iC4': 10.0,
-        'nC4': 10.0,
-        'iC5': 10.0,
-        'nC5': 10.0,
-        'nC6': 10.0,
-        'nC7': 10.0,
-        'nC8': 10.0
-    }
-    
-    # Expected expanded uncertainties (k=2) from NFOGM Fiscal Gas Metering Station Uncertainty (GasMet) tool (mol%)
-    expected_expanded_uncertainty = {
-        'C1': 0.609,
-        'C2': 0.325,
-        'C3': 0.222,
-        'iC4': 0.168,
-        'nC4': 0.168,
-        'iC5': 0.135,
-        'nC5': 0.135,
-        'nC6': 0.113,
-        'nC7': 0.0975,
-        'nC8': 0.0855
-    }
-    
-    # Expected relative uncertainties (k=2) from NFOGM Fiscal Gas Metering Station Uncertainty (GasMet) tool (%)
-    expected_relative_uncertainty = {
-        'C1': 6.09,
-        'C2': 3.25,
-        'C3': 2.22,
-        'iC4': 1.68,
-        'nC4': 1.68,
-        'iC5': 1.35,
-        'nC5': 1.35,
-        'nC6': 1.13,
-        'nC7': 0.975,
-        'nC8': 0.855
-    }
-    
-    # Calculate uncertainties using NORSOK I-106 method
-    result = gas_composition.component_uncertainty_from_norsok_I106(composition)
+    component_conc = result['mean']
+    calculated_standard_unc = result['standard_uncertainty']
+    if isinstance(component_conc, dict):
+        component_conc = np.array([component_conc[component] for component in components])
+        calculated_standard_unc = np.array([calculated_standard_unc[component] for component in components])
     
     # Check that composition is normalized to 100%
-    total_composition = sum(result['mean'].values())
-    assert abs(total_composition - 100.0) < 1e-10, "Composition should be normalized to 100%"
-    
-    print("\nNORSOK I-106 Test Results (Case 3 - Equal 10% Mole %, C1-C8):")
-    print("="*110)
-    print(f"{'Comp':<6} {'Conc':<8} {'Expected':<12} {'Calc':<12} {'Error':<10} {'Status':<8} "
-          f"{'Expected':<12} {'Calc':<12} {'Error':<10} {'Status'}")
-    print(f"{'':6} {'mol%':<8} {'U(k=2)':<12} {'U(k=2)':<12} {'mol%':<10} {'abs':<8} "
-          f"{'U%(k=2)':<12} {'U%(k=2)':<12} {'%':<10} {'rel'}")
-    print("-"*110)
-    
-    # Check each component's expanded uncertainty (k=2) - both absolute and relative
-    all_passed = True
-    for component in expected_expanded_uncertainty.keys():
-        calculated_standard_unc = result['standard_uncertainty'][component]
-        calculated_expanded_unc = calculated_standard_unc * 2  # Convert k=1 to k=2
-        expected_expanded_unc = expected_expanded_uncertainty[component]
-        
-        # Calculate relative uncertainties (as percentage of concentration)
-        component_conc = result['mean'][component]
-        if component_conc > 0:
-            calculated_relative_unc = (calculated_expanded_unc / component_conc) * 100
-        else:
-            calculated_relative_unc = 0.0
-        expected_relative_unc = expected_relative_uncertainty[component]
-        
-        # Calculate absolute errors
-        abs_error = abs(calculated_expanded_unc - expected_expanded_unc)
-        rel_error = abs(calculated_relative_unc - expected_relative_unc)
-        
-        # Tolerance: 0.01 mol% for absolute uncertainty, 0.5% for relative uncertainty
-        abs_status = "PASS" if abs_error < 0.01 else "FAIL"
-        rel_status = "PASS" if rel_error < 0.5 else "FAIL"
-        
-        if abs_status == "FAIL" or rel_status == "FAIL":
-            all_passed = False
-        
-        print(f"{component:<6} {component_conc:<8.2f} {expected_expanded_unc:<12.4f} "
-              f"{calculated_expanded_unc:<12.4f} {abs_error:<10.4f} {abs_status:<8} "
-              f"{expected_relative_unc:<12.2f} {calculated_relative_unc:<12.2f} "
-              f"{rel_error:<10.2f} {rel_status}")
-    
-    print("-"*110)
-    print(f"Overall: {'ALL TESTS PASSED' if all_passed else 'SOME TESTS FAILED'}")
-    print("="*110)
-    
-    assert all_passed, "Some component uncertainties did not match NFOGM reference within tolerance"
-
-
-def test_astm_d1945_nfogm_reference_case1():
+    assert abs(np.sum(component_conc) - 100.0) < 1e-10, "Composition should be normalized to 100%"
+    
+    calculated_expanded_unc = calculated_standard_unc * 2  # Convert k=1 to k=2
+    
+    # Calculate relative uncertainties (as percentage of concentration)
+    calculated_relative_unc = np.divide(
+        calculated_expanded_unc * 100, component_conc, out=np.zeros_like(component_conc), where=component_conc > 0
+    )
+    
+    # Tolerance: 0.01 mol% for absolute uncertainty, 0.5% for relative uncertainty
+    abs_passed = np.allclose(calculated_expanded_unc, expected_expanded_unc, rtol=0, atol=0.01)
+    rel_passed = np.allclose(calculated_relative_unc, expected_relative_unc, rtol=0, atol=0.5)
+    
+    # Print the comparison table when verbose output is enabled, or if the test fails (shown in the pytest report)
+    if _VERBOSE or not (abs_passed and rel_passed):
+        abs_error = np.abs(calculated_expanded_unc - expected_expanded_unc)
+        rel_error = np.abs(calculated_relative_unc - expected_relative_unc)
+        print(f"\n{label} Test Results:")
+        print("="*110)
+        results_table = pd.DataFrame({
+            'Conc [mol%]': component_conc,
+            'Expected U(k=2) [mol%]': expected_expanded_unc,
+            'Calc U(k=2) [mol%]': calculated_expanded_unc,
+            'Error [mol%]': abs_error,
+            'Status abs': np.where(abs_error <= 0.01, 'PASS', 'FAIL'),
+            'Expected U(k=2) [%]': expected_relative_unc,
+            'Calc U(k=2) [%]': calculated_relative_unc,
+            'Error [%]': rel_error,
+            'Status rel': np.where(rel_error <= 0.5, 'PASS', 'FAIL'),
+        }, index=components)
+        print(results_table.to_string(float_format=lambda x: f'{x:.4f}'))
+        print("="*110)
+    
+    assert abs_passed, f"{label}: Absolute uncertainties did not match reference within tolerance"
+    assert rel_passed, f"{label}: Relative uncertainties did not match reference within tolerance"
+
+
+@pytest.mark.parametrize("method,composition,expected_expanded_unc,expected_relative_unc,label", CASES)
+def test_reference(method, composition, expected_expanded_unc, expected_relative_unc, label):
     """
-    Test ASTM D1945 method against NFOGM reference data.
-    
-    Composition and expected uncertainties tested against NFOGM Fiscal Gas 
-    Metering Station Uncertainty app. The uncertainties are 
-    expanded uncertainties at 95% confidence level (k=2).
+    Test the composition uncertainty methods against reference data. The uncertainties are expanded uncertainties 
+    at 95% confidence level (k=2).
     """
-    # Test composition (mole percent)
-    composition = {
-        'C1': 86.3,
-        'C2': 6.01,
-        'C3': 3.0,
-        'iC4': 1.1,
-        'nC4': 0.9,
-        'iC5': 0.35,
-        'nC5': 0.35,
-        'N2': 0.9,
-        'CO2': 1.1
-    }
-    
-    # Expected expanded uncertainties (k=2) from NFOGM Fiscal Gas Metering Station Uncertainty (GasMet) tool (mol%)
-    expected_expanded_uncertainty = {
-        'C1': 0.15,
-        'C2': 0.12,
-        'C3': 0.1,
-        'iC4': 0.1,
-        'nC4': 0.07,
-        'iC5': 0.07,
-        'nC5': 0.07,
-        'N2': 0.07,
-        'CO2': 0.1
-    }
-    
-    # Expected relative uncertainties (k=2) from NFOGM Fiscal Gas Metering Station Uncertainty (GasMet) tool (%)
-    expected_relative_uncertainty = {
-        'C1': 0.174,
-        'C2': 2.0,
-        'C3': 3.33,
-        'iC4': 9.09,
-        'nC4': 7.78,
-        'iC5': 20.0,
-        'nC5': 20.0,
-        'N2': 7.78,
-        'CO2': 9.09
-    }
-    
-    # Calculate uncertainties using ASTM D1945 method
-    result = gas_composition.component_uncertainty_from_ASTM_D1945(composition)
-    
-    # Check that composition is normalized to 100%
-    total_composition = sum(result['mean'].values())
-    assert abs(total_composition - 100.0) < 1e-10, "Composition should be normalized to 100%"
-    
-    print("\nASTM D1945 Test Results:")
-    print("="*110)
-    print(f"{'Comp':<6} {'Conc':<8} {'Expected':<12} {'Calc':<12} {'Error':<10} {'Status':<8} "
-          f"{'Expected':<12} {'Calc':<12} {'Error':<10} {'Status'}")
-    print(f"{'':6} {'mol%':<8} {'U(k=2)':<12} {'U(k=2)':<12} {'mol%':<10} {'abs':<8} "
-          f"{'U%(k=2)':<12} {'U%(k=2)':<12} {'%':<10} {'rel'}")
-    print("-"*110)
-    
-    # Check each component's expanded uncertainty (k=2) - both absolute and relative
-    all_passed = True
-    for component in expected_expanded_uncertainty.keys():
-        calculated_standard_unc = result['standard_uncertainty'][component]
-        calculated_expanded_unc = calculated_standard_unc * 2  # Convert k=1 to k=2
-        expected_expanded_unc = expected_expanded_uncertainty[component]
-        
-        # Calculate relative uncertainties (as percentage of concentration)
-        component_conc = result['mean'][component]
-        if component_conc > 0:
-            calculated_relative_unc = (calculated_expanded_unc / component_conc) * 100
-        else:
-            calculated_relative_unc = 0.0
-        expected_relative_unc = expected_relative_uncertainty[component]
-        
-        # Calculate absolute errors
-        abs_error = abs(calculated_expanded_unc - expected_expanded_unc)
-        rel_error = abs(calculated_relative_unc - expected_relative_unc)
-        
-        # Tolerance: 0.01 mol% for absolute uncertainty, 0.5% for relative uncertainty
-        abs_status = "PASS" if abs_error < 0.01 else "FAIL"
-        rel_status = "PASS" if rel_error < 0.5 else "FAIL"
-        
-        if abs_status == "FAIL" or rel_status == "FAIL":
-            all_passed = False
-        
-        print(f"{component:<6} {component_conc:<8.2f} {expected_expanded_unc:<12.4f} "
-              f"{calculated_expanded_unc:<12.4f} {abs_error:<10.4f} {abs_status:<8} "
-              f"{expected_relative_unc:<12.2f} {calculated_relative_unc:<12.2f} "
-              f"{rel_error:<10.2f} {rel_status}")
+    result = method(composition)
     
-    print("-"*110)
-    print(f"Overall: {'ALL TESTS PASSED' if all_passed else 'SOME TESTS FAILED'}")
-    print("="*110)
-    
-    assert all_passed, "Some component uncertainties did not match NFOGM reference within tolerance"
+    _check(result, tuple(composition), expected_expanded_unc, expected_relative_unc, label)
 
 
-def test_astm_d1945_nfogm_reference_case2():
+@pytest.mark.parametrize("method", [astm_d1945, norsok_i106, hagenvik2024])
+def test_repeated_composition(method):
     """
-    Test ASTM D1945 method against NFOGM reference data (case 2).
-    
-    Composition with varying concentrations across different ASTM ranges.
-    Composition and expected uncertainties from NFOGM Fiscal Gas 
-    Metering Station Uncertainty app. The uncertainties are 
-    expanded uncertainties at 95% confidence level (k=2).
+    Test that repeated calls with the same composition return equal, independent results.
     """
-    # Test composition (mole percent)
-    composition = {
-        'C1': 60.0,
-        'C2': 20.0,
-        'C3': 10.0,
-        'iC4': 5.0,
-        'nC4': 5.0
-    }
-    
-    # Expected expanded uncertainties (k=2) from NFOGM Fiscal Gas Metering Station Uncertainty (GasMet) tool (mol%)
-    expected_expanded_uncertainty = {
-        'C1': 0.15,
-        'C2': 0.15,
-        'C3': 0.15,
-        'iC4': 0.12,
-        'nC4': 0.12
-    }
+    composition = {'C1': 85.0, 'C2': 10.0, 'N2': 5.0}
     
-    # Expected relative uncertainties (k=2) from NFOGM Fiscal Gas Metering Station Uncertainty (GasMet) tool (%)
-    expected_relative_uncertainty = {
-        'C1': 0.25,
-        'C2': 0.75,
-        'C3': 1.5,
-        'iC4': 2.4,
-        'nC4': 2.4
-    }
+    result_1 = method(composition)
+    result_1['standard_uncertainty']['C2'] = 0.0
+    result_1['distribution']['C1'] = 'none'
     
-    # Calculate uncertainties using ASTM D1945 method
-    result = gas_composition.component_uncertainty_from_ASTM_D1945(composition)
-    
-    # Check that composition is normalized to 100%
-    total_composition = sum(result['mean'].values())
-    assert abs(total_composition - 100.0) < 1e-10, "Composition should be normalized to 100%"
+    result_2 = method(composition)
     
-    print("\nASTM D1945 Test Results (Case 2):")
-    print("="*110)
-    print(f"{'Comp':<6} {'Conc':<8} {'Expected':<12} {'Calc':<12} {'Error':<10} {'Status':<8} "
-          f"{'Expected':<12} {'Calc':<12} {'Error':<10} {'Status'}")
-    print(f"{'':6} {'mol%':<8} {'U(k=2)':<12} {'U(k=2)':<12} {'mol%':<10} {'abs':<8} "
-          f"{'U%(k=2)':<12} {'U%(k=2)':<12} {'%':<10} {'rel'}")
-    print("-"*110)
-    
-    # Check each component's expanded uncertainty (k=2) - both absolute and relative
-    all_passed = True
-    for component in expected_expanded_uncertainty.keys():
-        calculated_standard_unc = result['standard_uncertainty'][component]
-        calculated_expanded_unc = calculated_standard_unc * 2  # Convert k=1 to k=2
-        expected_expanded_unc = expected_expanded_uncertainty[component]
-        
-        # Calculate relative uncertainties (as percentage of concentration)
-        component_conc = result['mean'][component]
-        if component_conc > 0:
-            calculated_relative_unc = (calculated_expanded_unc / component_conc) * 100
-        else:
-            calculated_relative_unc = 0.0
-        expected_relative_unc = expected_relative_uncertainty[component]
-        
-        # Calculate absolute errors
-        abs_error = abs(calculated_expanded_unc - expected_expanded_unc)
-        rel_error = abs(calculated_relative_unc - expected_relative_unc)
-        
-        # Tolerance: 0.01 mol% for absolute uncertainty, 0.5% for relative uncertainty
-        abs_status = "PASS" if abs_error < 0.01 else "FAIL"
-        rel_status = "PASS" if rel_error < 0.5 else "FAIL"
-        
-        if abs_status == "FAIL" or rel_status == "FAIL":
-            all_passed = False
-        
-        print(f"{component:<6} {component_conc:<8.2f} {expected_expanded_unc:<12.4f} "
-              f"{calculated_expanded_unc:<12.4f} {abs_error:<10.4f} {abs_status:<8} "
-              f"{expected_relative_unc:<12.2f} {calculated_relative_unc:<12.2f} "
-              f"{rel_error:<10.2f} {rel_status}")
-    
-    print("-"*110)
-    print(f"Overall: {'ALL TESTS PASSED' if all_passed else 'SOME TESTS FAILED'}")
-    print("="*110)
-    
-    assert all_passed, "Some component uncertainties did not match NFOGM reference within tolerance"
+    assert result_2['standard_uncertainty']['C2'] > 0.0
+    assert result_2['distribution']['C1'] == 'normal'
+    assert result_2['mean'] == result_1['mean']
 
 
-def test_hagenvik2024_reference_case1():
+@pytest.mark.parametrize("method,method_array", [
+    (astm_d1945, astm_d1945_array),
+    (norsok_i106, norsok_i106_array),
+    (hagenvik2024, hagenvik2024_array),
+])
+def test_array_of_compositions(method, method_array):
     """
-    Test Hagenvik 2024 method against calculated reference data.
-    
-    This test is based on calculations from the Hagenvik 2024 publication,
-    not verified against NFOGM Fiscal Gas Metering Station Uncertainty (GasMet) tool as this method is not available there.
-    The uncertainties are expanded uncertainties at 95% confidence level (k=2).
+    Test that a 2D array of compositions (one per row) gives the same results as evaluating each composition separately.
     """
-    # Test composition (mole percent)
-    composition = {
-        'N2': 1.0,
-        'CO2': 2.0,
-        'C1': 85.0,
-        'C2': 5.0,
-        'C3': 3.0,
-        'iC4': 1.0,
-        'nC4': 1.0,
-        'iC5': 0.5,
-        'nC5': 0.5,
-        'nC6': 1.0
-    }
+    components = ('N2', 'CO2', 'C1', 'C2', 'C3', 'nC6')
+    compositions = np.random.default_rng(1).uniform(0.0, 10.0, (20, len(components)))
+    compositions[:, 2] += 70.0
+    compositions[0, 3] = 0.0
     
-    # Expected expanded uncertainties (k=2) from calculation (mol%)
-    expected_expanded_uncertainty = {
-        'N2': 0.0680,
-        'CO2': 0.0371,
-        'C1': 0.0000,
-        'C2': 0.0678,
-        'C3': 0.1451,
-        'iC4': 0.0360,
-        'nC4': 0.0540,
-        'iC5': 0.0245,
-        'nC5': 0.0332,
-        'nC6': 0.2060
-    }
+    result = method_array(components, compositions)
     
-    # Expected relative uncertainties (k=2) calculated as (U/concentration)*100
-    expected_relative_uncertainty = {
-        'N2': 6.80,
-        'CO2': 1.855,
-        'C1': 0.000,
-        'C2': 1.356,
-        'C3': 4.837,
-        'iC4': 3.60,
-        'nC4': 5.40,
-        'iC5': 4.90,
-        'nC5': 6.64,
-        'nC6': 20.60
-    }
-    
-    # Calculate uncertainties using Hagenvik 2024 method
-    result = gas_composition.component_uncertainty_from_haagenvik2024(composition)
-    
-    # Check that composition is normalized to 100%
-    total_composition = sum(result['mean'].values())
-    assert abs(total_composition - 100.0) < 1e-10, "Composition should be normalized to 100%"
-    
-    print("\nHagenvik 2024 Test Results:")
-    print("="*110)
-    print(f"{'Comp':<6} {'Conc':<8} {'Expected':<12} {'Calc':<12} {'Error':<10} {'Status':<8} "
-          f"{'Expected':<12} {'Calc':<12} {'Error':<10} {'Status'}")
-    print(f"{'':6} {'mol%':<8} {'U(k=2)':<12} {'U(k=2)':<12} {'mol%':<10} {'abs':<8} "
-          f"{'U%(k=2)':<12} {'U%(k=2)':<12} {'%':<10} {'rel'}")
-    print("-"*110)
-    
-    # Check each component's expanded uncertainty (k=2) - both absolute and relative
-    all_passed = True
-    for component in expected_expanded_uncertainty.keys():
-        calculated_standard_unc = result['standard_uncertainty'][component]
-        calculated_expanded_unc = calculated_standard_unc * 2  # Convert k=1 to k=2
-        expected_expanded_unc = expected_expanded_uncertainty[component]
-        
-        # Calculate relative uncertainties (as percentage of concentration)
-        component_conc = result['mean'][component]
-        if component_conc > 0:
-            calculated_relative_unc = (calculated_expanded_unc / component_conc) * 100
-        else:
-            calculated_relative_unc = 0.0
-        expected_relative_unc = expected_relative_uncertainty[component]
-        
-        # Calculate absolute errors
-        abs_error = abs(calculated_expanded_unc - expected_expanded_unc)
-        rel_error = abs(calculated_relative_unc - expected_relative_unc)
-        
-        # Tolerance: 0.01 mol% for absolute uncertainty, 0.5% for relative uncertainty
-        abs_status = "PASS" if abs_error < 0.01 else "FAIL"
-        rel_status = "PASS" if rel_error < 0.5 else "FAIL"
-        
-        if abs_status == "FAIL" or rel_status == "FAIL":
-            all_passed = False
-        
-        print(f"{component:<6} {component_conc:<8.2f} {expected_expanded_unc:<12.4f} "
-              f"{calculated_expanded_unc:<12.4f} {abs_error:<10.4f} {abs_status:<8} "
-              f"{expected_relative_unc:<12.2f} {calculated_relative_unc:<12.2f} "
-              f"{rel_error:<10.2f} {rel_status}")
-    
-    print("-"*110)
-    print(f"Overall: {'ALL TESTS PASSED' if all_passed else 'SOME TESTS FAILED'}")
-    print("="*110)
-    
-    assert all_passed, "Some component uncertainties did not match reference within tolerance"
+    assert result['mean'].shape == compositions.shape
+    assert result['standard_uncertainty'].shape == compositions.shape
+    for i, row in enumerate(compositions):
+        result_row = method(dict(zip(components, row)))
+        np.testing.assert_allclose(result['mean'][i], list(result_row['mean'].values()))
+        np.testing.assert_allclose(result['standard_uncertainty'][i], list(result_row['standard_uncertainty'].values()))
 
 
-def test_hagenvik2024_reference_case2():
+@pytest.mark.parametrize("method", [astm_d1945, norsok_i106, hagenvik2024])
+def test_invalid_composition(method):
     """
-    Test Hagenvik 2024 method against calculated reference data (case 2).
-    
-    This test is based on calculations from the Hagenvik 2024 publication,
-    not verified against NFOGM Fiscal Gas Metering Station Uncertainty (GasMet) tool as this method is not available there.
-    The uncertainties are expanded uncertainties at 95% confidence level (k=2).
+    Test that unsupported components and a zero total composition raise ValueError.
     """
-    # Test composition (mole percent)
-    composition = {
-        'N2': 3.0,
-        'CO2': 4.0,
-        'C1': 87.0,
-        'C2': 2.0,
-        'C3': 1.0,
-        'iC4': 1.0,
-        'nC4': 1.0,
-        'iC5': 0.25,
-        'nC5': 0.25,
-        'nC6': 0.5
-    }
-    
-    # Expected expanded uncertainties (k=2) from calculation (mol%)
-    expected_expanded_uncertainty = {
-        'N2': 0.2051,
-        'CO2': 0.0530,
-        'C1': 0.0000,
-        'C2': 0.0756,
-        'C3': 0.0500,
-        'iC4': 0.0360,
-        'nC4': 0.0540,
-        'iC5': 0.0188,
-        'nC5': 0.0240,
-        'nC6': 0.1283
-    }
-    
-    # Expected relative uncertainties (k=2) calculated as (U/concentration)*100
-    expected_relative_uncertainty = {
-        'N2': 6.837,
-        'CO2': 1.325,
-        'C1': 0.000,
-        'C2': 3.78,
-        'C3': 5.00,
-        'iC4': 3.60,
-        'nC4': 5.40,
-        'iC5': 7.52,
-        'nC5': 9.60,
-        'nC6': 25.66
-    }
-    
-    # Calculate uncertainties using Hagenvik 2024 method
-    result = gas_composition.component_uncertainty_from_haagenvik2024(composition)
-    
-    # Check that composition is normalized to 100%
-    total_composition = sum(result['mean'].values())
-    assert abs(total_composition - 100.0) < 1e-10, "Composition should be normalized to 100%"
-    
-    print("\nHagenvik 2024 Test Results (Case 2):")
-    print("="*110)
-    print(f"{'Comp':<6} {'Conc':<8} {'Expected':<12} {'Calc':<12} {'Error':<10} {'Status':<8} "
-          f"{'Expected':<12} {'Calc':<12} {'Error':<10} {'Status'}")
-    print(f"{'':6} {'mol%':<8} {'U(k=2)':<12} {'U(k=2)':<12} {'mol%':<10} {'abs':<8} "
-          f"{'U%(k=2)':<12} {'U%(k=2)':<12} {'%':<10} {'rel'}")
-    print("-"*110)
-    
-    # Check each component's expanded uncertainty (k=2) - both absolute and relative
-    all_passed = True
-    for component in expected_expanded_uncertainty.keys():
-        calculated_standard_unc = result['standard_uncertainty'][component]
-        calculated_expanded_unc = calculated_standard_unc * 2  # Convert k=1 to k=2
-        expected_expanded_unc = expected_expanded_uncertainty[component]
-        
-        # Calculate relative uncertainties (as percentage of concentration)
-        component_conc = result['mean'][component]
-        if component_conc > 0:
-            calculated_relative_unc = (calculated_expanded_unc / component_conc) * 100
-        else:
-            calculated_relative_unc = 0.0
-        expected_relative_unc = expected_relative_uncertainty[component]
-        
-        # Calculate absolute errors
-        abs_error = abs(calculated_expanded_unc - expected_expanded_unc)
-        rel_error = abs(calculated_relative_unc - expected_relative_unc)
-        
-        # Tolerance: 0.01 mol% for absolute uncertainty, 0.5% for relative uncertainty
-        abs_status = "PASS" if abs_error < 0.01 else "FAIL"
-        rel_status = "PASS" if rel_error < 0.5 else "FAIL"
-        
-        if abs_status == "FAIL" or rel_status == "FAIL":
-            all_passed = False
-        
-        print(f"{component:<6} {component_conc:<8.2f} {expected_expanded_unc:<12.4f} "
-              f"{calculated_expanded_unc:<12.4f} {abs_error:<10.4f} {abs_status:<8} "
-              f"{expected_relative_unc:<12.2f} {calculated_relative_unc:<12.2f} "
-              f"{rel_error:<10.2f} {rel_status}")
-    
-    print("-"*110)
-    print(f"Overall: {'ALL TESTS PASSED' if all_passed else 'SOME TESTS FAILED'}")
-    print("="*110)
-    
-    assert all_passed, "Some component uncertainties did not match reference within tolerance"
-
-
-if __name__ == '__main__':
-    test_norsok_i106_nfogm_reference_case1()
-    test_norsok_i106_nfogm_reference_case2()
-    test_norsok_i106_nfogm_reference_case3()
-    test_astm_d1945_nfogm_reference_case1()
-    test_astm_d1945_nfogm_reference_case2()
-    test_hagenvik2024_reference_case1()
-    test_hagenvik2024_reference_case2()
+    with pytest.raises(ValueError, match="Unsupported components: \\['Xe'\\]"):
+        method({'C1': 90.0, 'Xe': 10.0})
+    with pytest.raises(ValueError, match="Total composition is zero"):
+        method({'C1': 0.0, 'C2': 0.0})
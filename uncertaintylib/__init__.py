@@ -21,6 +21,15 @@ OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 SOFTWARE.
 """
 
+import importlib
+
 from . import uncertainty_functions
-from . import plot_functions
-from . import uncertainty_models
\ No newline at end of file
+from . import uncertainty_models
+
+
+def __getattr__(name):
+    # plot_functions imports matplotlib, which is slow to import. It is imported on first use
+    # instead of with the package, so scripts that do not plot do not pay for it
+    if name == 'plot_functions':
+        return importlib.import_module('.plot_functions', __name__)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -24,10 +24,10 @@ SOFTWARE.
 
 import matplotlib.pyplot as plt
 import pandas as pd
-from typing import Optional, Sequence, Dict
+from typing import Optional, Sequence, Dict, Union
 
 def montecarlo_property_plot_and_table(
-    data: pd.DataFrame,
+    data: Union[pd.DataFrame, dict],
     property_id: str,
     xlim: Optional[Sequence[float]] = None,
     property_name: str = '',
@@ -40,8 +40,8 @@ def montecarlo_property_plot_and_table(
 
     Parameters
     ----------
-    data : pd.DataFrame
-        A DataFrame with Monte Carlo data generated from the provided parameters.
+    data : pd.DataFrame or dict
+        A DataFrame (or dictionary of arrays) with Monte Carlo data generated from the provided parameters.
         This is the output from the "monte_carlo_simulation" function in uncertainty_functions
     property_id : str
         Property to plot, which needs to correspond to the column heading in the Monte Carlo results.
@@ -22,15 +22,21 @@ SOFTWARE.
 """
 
 
-import copy
+import warnings
+import itertools
+import concurrent.futures
 import pandas as pd
 import numpy as np
-import scipy.stats
 
-from typing import Callable, Dict, Any, Optional
+from typing import Callable, Dict, Any, Optional, Union
 
 #%% Uncertainty functions
-def calculate_uncertainty(indata: dict, function: Callable[[dict], dict]) -> dict:
+def calculate_uncertainty(
+    indata: dict, 
+    function: Callable[[dict], dict], 
+    sensitivity_results: Optional[dict] = None, 
+    vectorized: bool = False
+) -> dict:
     """
     Analyze the uncertainty of output parameters for a given function and input data.
     The method used is the method described as "Determining combined standard uncertainty" for "Uncorrelated input quantities" 
@@ -53,6 +59,13 @@ def calculate_uncertainty(indata: dict, function: Callable[[dict], dict]) -> dic
                 A dictionary that holds the percentage standard uncertainty for each input parameter.
     function : callable
         A function that takes an input dictionary and returns a dictionary of output parameters.
+    sensitivity_results : dict, optional
+        Results from calculate_sensitivity_coefficients for the same function and mean values. If given, the sensitivity 
+        coefficients are not recalculated, which avoids evaluating the function again. This is useful when uncertainties 
+        are calculated for several sets of input uncertainties with the same mean values. Default is None.
+    vectorized : bool, optional
+        If True, the sensitivity coefficients are calculated with a single vectorized call to the function 
+        (see calculate_sensitivity_coefficients). Default is False.
 
     Returns
     -------
@@ -80,9 +93,10 @@ def calculate_uncertainty(indata: dict, function: Callable[[dict], dict]) -> dic
     
     # baseline_results = function(indata['mean']) #Calculate baseline results individually. However, these are also calculated when calculating sensitivity coefficients. Have therefore commented out this line, to improve calculation speed
     
-    #Calculate absolute and relative sensitivity coefficients.
+    #Calculate absolute and relative sensitivity coefficients, unless they are provided.
     #Baseline results are also calculated. That is the results by using the original input values (without perturbations)
-    sensitivity_results = calculate_sensitivity_coefficients(indata, function)
+    if sensitivity_results is None:
+        sensitivity_results = calculate_sensitivity_coefficients(indata, function, vectorized=vectorized)
     abs_sensitivity_coefficients = sensitivity_results['absolute_sensitivity_coefficients']
     rel_sensitivity_coefficients = sensitivity_results['relative_sensitivity_coefficients']
     baseline_results = sensitivity_results['baseline_results']
@@ -140,7 +154,12 @@ def calculate_uncertainty(indata: dict, function: Callable[[dict], dict]) -> dic
 
 
 
-def calculate_sensitivity_coefficients(indata: dict, function: Callable[[dict], dict]) -> dict:
+def calculate_sensitivity_coefficients(
+    indata: dict, 
+    function: Callable[[dict], dict], 
+    baseline_results: Optional[dict] = None, 
+    vectorized: bool = False
+) -> dict:
     """
     Calculate the absolute and relative sensitivity coefficients for input parameters to a given function.
     
@@ -166,6 +185,12 @@ def calculate_sensitivity_coefficients(indata: dict, function: Callable[[dict],
             A dictionary that holds the maximum values for each input parameter. Not specified if missing.
     function : callable
         A function that takes an input dictionary and returns a dictionary of output parameters.
+    baseline_results : dict, optional
+        Output of the function for the original inputs (given by the 'mean' input dictionary), if already calculated. 
+        If given, the function is only evaluated for the perturbed inputs. Default is None.
+    vectorized : bool, optional
+        If True, the outputs for all perturbed inputs are calculated in a single call to the function, with arrays holding 
+        one perturbed set of inputs per element. The function must then support NumPy array inputs. Default is False.
 
     Returns
     -------
@@ -180,22 +205,22 @@ def calculate_sensitivity_coefficients(indata: dict, function: Callable[[dict],
     """
     
     input_dict = indata['mean']
-    
-    # Create a copy of the input dictionary so we can modify it safely
-    input_dict_copy = copy.deepcopy(input_dict)
-
-    # Calculate the output of the function for the original inputs
-    original_output = function(input_dict_copy)
 
+    # Calculate the output of the function for the original inputs, unless it is provided
+    if baseline_results is None:
+        original_output = function(dict(input_dict))
+    else:
+        original_output = baseline_results
+    
     # Create dictionaries to hold the sensitivity coefficients
     abs_sensitivity_coefficients = {}
     rel_sensitivity_coefficients = {}
+    
+    # Perturbation of each input variable that is not set to distribution 'none'
+    perturbations = {}
 
     # Loop over each input variable
-    for input_var in input_dict_copy:
-
-            # Create a copy of the original input dictionary
-            input_dict_copy2 = copy.deepcopy(input_dict)
+    for input_var in input_dict:
             
             if 'distribution' in indata: # Check if the distribution is nan (blank), in which the distribution will be set to 'none'
                 if type(indata['distribution'][input_var]) is float and np.isnan(indata['distribution'][input_var]):
@@ -209,48 +234,63 @@ def calculate_sensitivity_coefficients(indata: dict, function: Callable[[dict],
                 rel_sensitivity_coefficients[input_var] = {key : 0.0 for key in original_output}
             
             else:
+                original_input_value = input_dict[input_var]
                 
-    
-                # Calculate the output with a small perturbation to the input
-                perturbation = input_dict_copy2[input_var]*1.01 - input_dict_copy2[input_var] #  # a small perturbation
+                # A small perturbation of the input
+                perturbation = original_input_value*1.01 - original_input_value
                 
                 if perturbation == 0.0:
                     perturbation = 0.0001
                 
-                input_dict_copy2[input_var] += perturbation
-                
-                #Calculate perturbed output
-                perturbed_output = function(input_dict_copy2)
-        
-                # Calculate the sensitivity coefficient for this input variable (as a scalar)
-                abs_sensitivity_coefficients[input_var] = {}
-                rel_sensitivity_coefficients[input_var] = {}
-                original_input_value = input_dict_copy[input_var]
-                
-                for key in original_output:                
-                    # Calculate the percent change in the input variable caused by the perturbation
-                    #If original_input_value is 0, return nan
-                    if original_input_value==0.0:
-                        percent_change = np.nan
-                    else:
-                        percent_change = perturbation / original_input_value * 100
-        
-                    # Calculate the absolute sensitivity coefficient for this input variable and output variable
-                    abs_sensitivity_coefficient = (
-                        perturbed_output[key] - original_output[key]
-                    ) / perturbation
-        
-                    # Calculate the relative sensitivity coefficient for this input variable and output variable
-                    if original_output[key]==0.0:
-                        rel_sensitivity_coefficient = np.nan
-                    else:
-                        percent_output_change = 100*(perturbed_output[key] - original_output[key])/original_output[key]
-                        rel_sensitivity_coefficient = percent_output_change/percent_change
-        
+                perturbations[input_var] = perturbation
+    
+    # Calculate the output with a small perturbation to each input
+    if vectorized and perturbations:
+        perturbed_outputs = _evaluate_perturbations_vectorized(input_dict, perturbations, function)
+    else:
+        # Calculate the perturbed output for each input. Each call gets its own (shallow) copy of the input dictionary, 
+        # so that a function keeping or modifying its input does not affect the other calls
+        perturbed_outputs = {
+            input_var: function({**input_dict, input_var: input_dict[input_var] + perturbation})
+            for input_var, perturbation in perturbations.items()
+        }
+    
+    for input_var, perturbation in perturbations.items():
+        original_input_value = input_dict[input_var]
+        perturbed_output = perturbed_outputs[input_var]
+
+        # Calculate the sensitivity coefficient for this input variable (as a scalar)
+        abs_sensitivity_coefficients[input_var] = {}
+        rel_sensitivity_coefficients[input_var] = {}
         
-                    # Add both sensitivities to their respective dictionaries
-                    abs_sensitivity_coefficients[input_var][key] = abs_sensitivity_coefficient
-                    rel_sensitivity_coefficients[input_var][key] = rel_sensitivity_coefficient
+        for key in original_output:                
+            # Calculate the percent change in the input variable caused by the perturbation
+            #If original_input_value is 0, return nan
+            if original_input_value==0.0:
+                percent_change = np.nan
+            else:
+                percent_change = perturbation / original_input_value * 100
+
+            # Calculate the absolute sensitivity coefficient for this input variable and output variable
+            abs_sensitivity_coefficient = (
+                perturbed_output[key] - original_output[key]
+            ) / perturbation
+
+            # Calculate the relative sensitivity coefficient for this input variable and output variable
+            if original_output[key]==0.0:
+                rel_sensitivity_coefficient = np.nan
+            else:
+                percent_output_change = 100*(perturbed_output[key] - original_output[key])/original_output[key]
+                rel_sensitivity_coefficient = percent_output_change/percent_change
+
+
+            # Add both sensitivities to their respective dictionaries
+            abs_sensitivity_coefficients[input_var][key] = abs_sensitivity_coefficient
+            rel_sensitivity_coefficients[input_var][key] = rel_sensitivity_coefficient
+
+    # Keep the order of the input variables
+    abs_sensitivity_coefficients = {input_var: abs_sensitivity_coefficients[input_var] for input_var in input_dict}
+    rel_sensitivity_coefficients = {input_var: rel_sensitivity_coefficients[input_var] for input_var in input_dict}
 
     results = {
         'absolute_sensitivity_coefficients' : abs_sensitivity_coefficients,
@@ -262,7 +302,41 @@ def calculate_sensitivity_coefficients(indata: dict, function: Callable[[dict],
 
 
 
-def monte_carlo_simulation(mc_input: dict, function: Callable[[dict], dict], n: int) -> pd.DataFrame:
+def _evaluate_perturbations_vectorized(input_dict: dict, perturbations: dict, function: Callable[[dict], dict]) -> dict:
+    """
+    Evaluates the function once with arrays of inputs, where element j of each array holds the input for the evaluation 
+    with the j-th input in perturbations perturbed. Returns the output dictionary of each perturbed input. Used by 
+    calculate_sensitivity_coefficients for functions supporting NumPy array inputs.
+    """
+    m = len(perturbations)
+    perturbed_inputs = {input_var: np.full(m, value, dtype=np.float64) for input_var, value in input_dict.items()}
+    for j, (input_var, perturbation) in enumerate(perturbations.items()):
+        perturbed_inputs[input_var][j] += perturbation
+    
+    outputs = {}
+    for key, val in function(perturbed_inputs).items():
+        val = np.asarray(val)
+        if val.shape != (m,):
+            # Scalar outputs (not depending on the inputs) are repeated for all evaluations
+            val = np.full(m, val)
+        outputs[key] = val
+    
+    return {input_var: {key: val[j] for key, val in outputs.items()} for j, input_var in enumerate(perturbations)}
+
+
+
+def monte_carlo_simulation(
+    mc_input: dict,
+    function: Callable[[dict], dict],
+    n: int,
+    vectorized: bool = False,
+    seed: Optional[Union[int, np.random.SeedSequence, np.random.Generator]] = None,
+    dtype: type = np.float64,
+    samples: Optional[Dict[str, np.ndarray]] = None,
+    return_as_dataframe: bool = True,
+    sampling_method: str = 'random',
+    max_workers: Optional[int] = None
+) -> Union[pd.DataFrame, Dict[str, np.ndarray]]:
     """
     Runs a Monte Carlo simulation for the given input arguments and the provided function and returns the evaluation of the function 
     with Monte Carlo data as a pandas DataFrame.
@@ -293,14 +367,149 @@ def monte_carlo_simulation(mc_input: dict, function: Callable[[dict], dict], n:
             'max' : dict, optional
                 A dictionary with input parameter names as keys and maximum values for each parameter as values. If not present in 'mc_input', the distribution will not be truncated at a maximum value.
     function : callable
-        The function to be evaluated
+        The function to be evaluated. It must return a dictionary of outputs
     n : int
         The number of Monte Carlo perturbations to run
+    vectorized : bool, optional
+        If True, the function is called once with arrays of all n Monte Carlo samples for each input parameter, 
+        instead of once per sample. The function must then support NumPy array inputs, and return arrays of length n 
+        (or scalars, which are repeated for all samples). Default is False.
+    seed : int, numpy.random.SeedSequence or numpy.random.Generator, optional
+        Seed for the random number generator (passed to numpy.random.default_rng), used to make the simulation reproducible. 
+        For parallel simulations, give each process its own child seed, for example from numpy.random.SeedSequence.spawn. 
+        Default is None, which gives a new random state for each simulation. 
+        Note that the samples are drawn from a numpy.random.Generator, so the global NumPy seed (np.random.seed) has no 
+        effect on the simulation. Use this argument instead to make simulations reproducible.
+    dtype : numpy dtype, optional
+        Floating point type of the generated input samples. np.float32 halves the memory and bandwidth used for the samples, 
+        which can be useful for very large vectorized simulations, at the cost of precision. Inputs that are not sampled 
+        keep the type of their mean value (see sample_perturbations). Default is np.float64.
+    samples : dict, optional
+        Input samples from sample_perturbations, with arrays of n samples for each input parameter. If given, these samples 
+        are used instead of generating new ones, and seed and dtype are ignored. Default is None.
+    return_as_dataframe : bool, optional
+        If True, return the results as a DataFrame. If False, return the results as a dictionary of arrays, which avoids 
+        the overhead of pandas. The post-processing functions in this module accept both. Default is True.
+    sampling_method : str, optional
+        Method used to generate the input samples, see sample_perturbations. 'random' (simple random sampling), 
+        'lhs' (Latin hypercube sampling) or 'sobol' (scrambled Sobol sequence). Default is 'random'.
+    max_workers : int, optional
+        Number of worker processes used to evaluate the function, when vectorized is False. The samples are split into chunks 
+        which are evaluated in parallel. This is useful for expensive functions, such as equations of state. The function must 
+        then be picklable (for example defined at module level, not a lambda), and the calling script must be protected 
+        by if __name__ == '__main__' on platforms that do not fork. Default is None, which evaluates all samples in the calling process.
+
+    Returns
+    -------
+    pd.DataFrame or dict
+        A DataFrame (or dictionary of arrays) of the function evaluations with Monte Carlo data generated from the provided parameters
+
+    """
+    
+    if samples is None:
+        random_input_data = sample_perturbations(mc_input, n, seed=seed, dtype=dtype, sampling_method=sampling_method)
+    else:
+        random_input_data = samples
+
+    outputs = {}
+    if vectorized:
+        # Evaluate the function once for all samples. Outputs that do not depend on the samples are repeated for all samples
+        output_dict = function(random_input_data)
+        for key, val in output_dict.items():
+            val = np.asarray(val)
+            outputs[key] = val if val.shape == (n,) else np.full(n, val)
+    
+    else:
+        if max_workers is not None and max_workers > 1:
+            # Evaluate chunks of samples in worker processes. Several chunks per worker balance the load between the workers
+            bounds = np.linspace(0, n, 4*max_workers + 1).astype(int)
+            chunks = [
+                {input_var: random_input_data[input_var][start:stop] for input_var in mc_input['mean']}
+                for start, stop in zip(bounds[:-1], bounds[1:]) if stop > start
+            ]
+            with concurrent.futures.ProcessPoolExecutor(max_workers=max_workers) as executor:
+                output_dicts = list(itertools.chain.from_iterable(
+                    executor.map(_evaluate_samples, itertools.repeat(function), chunks)
+                ))
+        else:
+            output_dicts = (
+                function({input_var: random_input_data[input_var][i] for input_var in mc_input['mean']})
+                for i in range(n)
+            )
+        
+        # Loop through all input data and evaluate function. The outputs are written to one preallocated array per output, 
+        # created when the output first appears. Outputs missing from an evaluation are left as nan. 
+        # Float outputs use a float array. Other outputs (integers, booleans, strings etc.) use an object array, 
+        # which is converted to the inferred type after the loop. A float output that later returns a value that 
+        # cannot be stored as a float is converted to an object array
+        object_outputs = []
+        for i, output_dict in enumerate(output_dicts):
+            for key, val in output_dict.items():
+                if key not in outputs:
+                    if np.ndim(val) == 0 and np.asarray(val).dtype.kind == 'f':
+                        outputs[key] = np.full(n, np.nan)
+                    else:
+                        outputs[key] = np.full(n, np.nan, dtype=object)
+                        object_outputs.append(key)
+                try:
+                    outputs[key][i] = val
+                except (TypeError, ValueError):
+                    outputs[key] = outputs[key].astype(object)
+                    object_outputs.append(key)
+                    outputs[key][i] = val
+        
+        for key in object_outputs:
+            outputs[key] = pd.Series(outputs[key]).infer_objects().to_numpy()
+
+    if not return_as_dataframe:
+        return outputs
+
+    # Combine output arrays into a single dataframe
+    output_df = pd.DataFrame(outputs, copy=False)
+    return output_df
+
+
+
+def sample_perturbations(
+    mc_input: dict,
+    n: int,
+    seed: Optional[Union[int, np.random.SeedSequence, np.random.Generator]] = None,
+    dtype: type = np.float64,
+    sampling_method: str = 'random'
+) -> Dict[str, np.ndarray]:
+    """
+    Generates the Monte Carlo samples of the input parameters, as used by monte_carlo_simulation. 
+    
+    The samples can be generated once and passed to monte_carlo_simulation (using the 'samples' argument) for several functions, 
+    which evaluates all functions with the same perturbations of the input parameters. 
+
+    Parameters
+    ----------
+    mc_input : dict
+        A nested dictionary of input parameters, as described in monte_carlo_simulation.
+    n : int
+        The number of Monte Carlo perturbations to generate
+    seed : int, numpy.random.SeedSequence or numpy.random.Generator, optional
+        Seed for the random number generator (passed to numpy.random.default_rng), used to make the samples reproducible. 
+        Default is None, which gives a new random state for each call. The global NumPy seed (np.random.seed) has no effect.
+    dtype : numpy dtype, optional
+        Floating point type of the generated samples. Inputs that are not sampled (distribution 'none' or zero standard 
+        uncertainty) keep the type of their mean value, for example integer settings. Default is np.float64.
+    sampling_method : str, optional
+        Method used to generate the samples of normal and uniform distributed inputs. Default is 'random'.
+            - 'random': Simple random sampling.
+            - 'lhs': Latin hypercube sampling. Each input is stratified into n equally probable intervals, with one sample 
+              in each interval. This typically gives the same accuracy of the output statistics with fewer samples.
+            - 'sobol': Scrambled Sobol sequence (quasi Monte Carlo). n should be a power of 2.
+        For 'lhs' and 'sobol', normal distributions are truncated at the minimum and maximum values using the inverse 
+        cumulative distribution function, instead of rejection sampling. Uniform distributions then require finite minimum 
+        and maximum values, and a ValueError is raised if the boundaries of a normal distribution are too far out in the 
+        tail to be sampled.
 
     Returns
     -------
-    pd.DataFrame
-        A DataFrame of the function evaluations with Monte Carlo data generated from the provided parameters
+    dict
+        A dictionary with input parameter names as keys and arrays of n samples as values
 
     """
     
@@ -310,62 +519,97 @@ def monte_carlo_simulation(mc_input: dict, function: Callable[[dict], dict], n:
     #If not, it will use the one that is given
     standard_uncertainty_used = standard_uncertainty_selector(mc_input) 
     
+    if sampling_method not in ['random', 'lhs', 'sobol']:
+        raise ValueError(f"sampling_method must be 'random', 'lhs' or 'sobol', not '{sampling_method}'.")
+    
+    rng = np.random.default_rng(seed)
     
-    # Generate all input data first
+    # Generate the samples of all input parameters
     random_input_data = {}
-    for input_var in mc_input['mean']:
-        mean = mc_input['mean'][input_var]
-        stddev = standard_uncertainty_used[input_var]
+    
+    # Normal distributed inputs without boundaries, drawn together after the loop
+    batched_normal = {}
+    
+    # Uniform distributed inputs with finite boundaries, drawn together after the loop
+    batched_uniform = {}
+    
+    # Inputs sampled from a Latin hypercube or Sobol sequence, drawn together after the loop
+    quasi_random_inputs = {}
+    
+    # Flat arrays of the input parameters, aligned with the input names
+    names, means, stddevs, min_values, max_values = _pack_inputs(mc_input, standard_uncertainty_used)
+    
+    for input_var, mean, stddev, min_value, max_value in zip(names, means, stddevs, min_values, max_values):
         
         #set distribution. If not given, defaults to normal distribution
         if 'distribution' in mc_input and type(mc_input['distribution'][input_var])==str:
             distribution=mc_input['distribution'][input_var].lower()
         else:
             distribution = 'normal'
-        
-        #Get minimum and maximum values. If not present, or set to nan, these values are set to infinity
-        if 'min' in mc_input and not np.isnan(mc_input['min'][input_var]):
-            min_value = mc_input['min'][input_var]
-        else:
-            min_value = -np.inf
-        
-        if 'max' in mc_input and not np.isnan(mc_input['max'][input_var]):
-            max_value = mc_input['max'][input_var]
-        else:
-            max_value = np.inf
-
 
         if stddev == 0:
-            # If standard uncertainty is zero, use the mean value directly (no need to generate a sample)
-            random_input_data[input_var] = np.full(n, mean)
+            # If standard uncertainty is zero, use the mean value directly (no need to generate a sample). 
+            # The original value is used, so that the type of for example integer settings is kept
+            random_input_data[input_var] = np.full(n, mc_input['mean'][input_var])
         else:
-            if distribution == 'normal':
+            if sampling_method != 'random' and distribution in ['normal', 'uniform']:
+                # Placeholder, to keep the order of the inputs
+                random_input_data[input_var] = None
+                quasi_random_inputs[input_var] = (distribution, mean, stddev, min_value, max_value)
+            
+            elif distribution == 'normal' and min_value == -np.inf and max_value == np.inf:
+                # Placeholder, to keep the order of the inputs
+                random_input_data[input_var] = None
+                batched_normal[input_var] = (mean, stddev)
+            
+            elif distribution == 'normal':
 
                 random_input_data[input_var] = generate_normal_distribution(
                     mean, 
                     stddev, 
                     n, 
                     lower_boundary=min_value, 
-                    upper_boundary=max_value
+                    upper_boundary=max_value,
+                    rng=rng,
+                    dtype=dtype
                     )
 
+            elif distribution == 'uniform' and np.isfinite(min_value) and np.isfinite(max_value):
+                # Placeholder, to keep the order of the inputs
+                random_input_data[input_var] = None
+                batched_uniform[input_var] = (min_value, max_value)
+
             elif distribution == 'uniform':
                 # Generate random sample using uniform distribution
-                random_input_data[input_var] = np.random.uniform(low=min_value, high=max_value, size=n)
+                random_input_data[input_var] = rng.uniform(low=min_value, high=max_value, size=n).astype(dtype, copy=False)
             
             elif distribution == 'none':
-                random_input_data[input_var] = np.full(n,mean)
-
-    # Loop through all input data and evaluate function
-    output_dicts = []
-    for i in range(n):
-        random_input_dict = {input_var: random_input_data[input_var][i] for input_var in mc_input['mean']}
-        output_dict = function(random_input_dict)
-        output_dicts.append(output_dict)
-
-    # Combine output dictionaries into a single dataframe
-    output_df = pd.DataFrame(output_dicts)
-    return output_df
+                random_input_data[input_var] = np.full(n, mc_input['mean'][input_var])
+    
+    if batched_normal:
+        # Draw the samples of all untruncated normal distributed inputs as one matrix of standard normal samples, 
+        # with one row per input, and scale each row with the standard deviation and mean of the input
+        means, stddevs = (np.array(values, dtype=dtype)[:, np.newaxis] for values in zip(*batched_normal.values()))
+        samples = rng.standard_normal((len(batched_normal), n), dtype=dtype)
+        samples *= stddevs
+        samples += means
+        for input_var, row in zip(batched_normal, samples):
+            random_input_data[input_var] = row
+    
+    if batched_uniform:
+        # Draw the samples of all uniform distributed inputs as one matrix of samples in [0, 1), 
+        # with one row per input, and scale each row to the minimum and maximum value of the input
+        min_values, max_values = (np.array(values, dtype=dtype)[:, np.newaxis] for values in zip(*batched_uniform.values()))
+        samples = rng.random((len(batched_uniform), n), dtype=dtype)
+        samples *= max_values - min_values
+        samples += min_values
+        for input_var, row in zip(batched_uniform, samples):
+            random_input_data[input_var] = row
+    
+    if quasi_random_inputs:
+        random_input_data.update(_quasi_random_samples(quasi_random_inputs, n, sampling_method, rng, dtype))
+    
+    return random_input_data
 
 
 
@@ -423,7 +667,9 @@ def generate_normal_distribution(
     N: int,
     lower_boundary: float = -np.inf,
     upper_boundary: float = np.inf,
-    iteration_limit: int = 1000
+    iteration_limit: int = 1000,
+    rng: Optional[np.random.Generator] = None,
+    dtype: type = np.float64
 ) -> np.ndarray:
     """
     Generates a random sample from a truncated normal distribution using rejection sampling.
@@ -443,6 +689,10 @@ def generate_normal_distribution(
         Upper boundary for the truncated distribution (default is inf).
     iteration_limit : int, optional
         Maximum number of iterations allowed for rejection sampling (default is 1000).
+    rng : numpy.random.Generator, optional
+        Random number generator used to draw the samples (default is None, which creates a new generator using numpy.random.default_rng).
+    dtype : numpy dtype, optional
+        Floating point type of the samples, np.float64 or np.float32 (default is np.float64).
     
     Returns
     -------
@@ -468,11 +718,21 @@ def generate_normal_distribution(
     if lower_boundary > upper_boundary:
         raise ValueError('lower_boundary cannot be greater than upper_boundary.')
     
+    if rng is None:
+        rng = np.random.default_rng()
+    
+    def draw(size):
+        # Scale standard normal samples in place, to keep the requested dtype
+        samples = rng.standard_normal(size, dtype=dtype)
+        samples *= stddev
+        samples += mean
+        return samples
+    
     # Initialize the number of iterations
     i=0
     
     # Generate an initial set of random samples from a normal distribution
-    normal = np.random.normal(mean, stddev, N)
+    normal = draw(N)
     
     # Remove samples outside of the lower and upper boundaries using rejection sampling
     normal = normal[(normal >= lower_boundary) & (normal<=upper_boundary)]
@@ -481,7 +741,7 @@ def generate_normal_distribution(
     while len(normal) < N and i < iteration_limit:
         
         # Generate additional samples from the normal distribution
-        extra = np.random.normal(mean, stddev, N - len(normal))
+        extra = draw(N - len(normal))
         
         # Remove samples outside of the lower and upper boundaries using rejection sampling
         extra = extra[(extra >= lower_boundary) & (extra<=upper_boundary)]
@@ -494,12 +754,86 @@ def generate_normal_distribution(
         
     # If the maximum number of iterations is reached, return an array of NaNs of the requested size
     if len(normal) < N:
-        return np.zeros(N) * np.nan
+        return np.full(N, np.nan, dtype=dtype)
         
     return normal
 
 
 
+def _pack_inputs(mc_input: dict, standard_uncertainty_used: dict) -> tuple:
+    """
+    Converts the nested input dictionary to flat arrays of the mean, standard uncertainty, minimum and maximum values, 
+    aligned with the list of input names. Minimum and maximum values that are not given (missing, None or nan) are set to 
+    -infinity and infinity respectively.
+    """
+    names = list(mc_input['mean'])
+    means = np.array([mc_input['mean'][name] for name in names], dtype=float)
+    stddevs = np.array([standard_uncertainty_used[name] for name in names], dtype=float)
+    
+    # Missing and None values are converted to nan, and then to infinity
+    min_values = np.array([mc_input.get('min', {}).get(name) for name in names], dtype=float)
+    min_values[np.isnan(min_values)] = -np.inf
+    max_values = np.array([mc_input.get('max', {}).get(name) for name in names], dtype=float)
+    max_values[np.isnan(max_values)] = np.inf
+    
+    return names, means, stddevs, min_values, max_values
+
+
+
+def _evaluate_samples(function: Callable[[dict], dict], samples: Dict[str, np.ndarray]) -> list:
+    """Evaluates the function for each sample in samples (a dictionary of arrays). Used by the worker processes in monte_carlo_simulation."""
+    n = len(next(iter(samples.values()))) if samples else 0
+    return [function({input_var: values[i] for input_var, values in samples.items()}) for i in range(n)]
+
+
+
+def _quasi_random_samples(
+    inputs: Dict[str, tuple],
+    n: int,
+    sampling_method: str,
+    rng: np.random.Generator,
+    dtype: type = np.float64
+) -> Dict[str, np.ndarray]:
+    """
+    Generates samples of normal and uniform distributed inputs from a Latin hypercube ('lhs') or a scrambled Sobol 
+    sequence ('sobol'), with one dimension per input. The points in the unit hypercube are transformed to the distribution 
+    of each input with its inverse cumulative distribution function. For normal distributions this is restricted to the 
+    probabilities between the minimum and maximum values, which gives a truncated normal distribution.
+    
+    inputs is a dictionary with input parameter names as keys and (distribution, mean, stddev, min_value, max_value) as values.
+    """
+    # Import inside function, as scipy.stats is slow to import and only needed for these sampling methods
+    import scipy.stats
+    
+    if sampling_method == 'lhs':
+        engine = scipy.stats.qmc.LatinHypercube(d=len(inputs), seed=rng)
+    else:
+        engine = scipy.stats.qmc.Sobol(d=len(inputs), scramble=True, seed=rng)
+    
+    unit_samples = engine.random(n)
+    
+    samples = {}
+    for (input_var, (distribution, mean, stddev, min_value, max_value)), u in zip(inputs.items(), unit_samples.T):
+        if distribution == 'normal':
+            if min_value > max_value:
+                raise ValueError('lower_boundary cannot be greater than upper_boundary.')
+            cdf_lower, cdf_upper = scipy.stats.norm.cdf([(min_value - mean)/stddev, (max_value - mean)/stddev])
+            if cdf_lower == cdf_upper:
+                raise ValueError(
+                    f"The boundaries of '{input_var}' are too far out in the tail of the normal distribution to be sampled "
+                    f"with sampling_method '{sampling_method}'."
+                )
+            values = mean + stddev*scipy.stats.norm.ppf(cdf_lower + u*(cdf_upper - cdf_lower))
+        else:
+            if not (np.isfinite(min_value) and np.isfinite(max_value)):
+                raise ValueError(f"Uniform distribution of '{input_var}' requires finite minimum and maximum values.")
+            values = min_value + u*(max_value - min_value)
+        samples[input_var] = values.astype(dtype, copy=False)
+    
+    return samples
+
+
+
 def standard_uncertainty_selector(indata: dict) -> dict:
     """
     Selects either standard uncertainty or percentage-based standard uncertainty for each
@@ -568,15 +902,31 @@ def standard_uncertainty_selector(indata: dict) -> dict:
 
 
 
+def _nanmean(values) -> float:
+    """Mean of the values, ignoring nan (as pandas does). Returns nan without warning if all values are nan."""
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore', RuntimeWarning)
+        return np.nanmean(values)
+
+
+
+def _nanstd(values) -> float:
+    """Sample standard deviation (ddof=1) of the values, ignoring nan (as pandas does). Returns nan without warning if there are too few values."""
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore', RuntimeWarning)
+        return np.nanstd(values, ddof=1)
+
+
+
 #%% Post-analysis functions - Used to post-process results from uncertainty calculations or to filter and compare results
-def calculate_percentage_deviation_from_mean(dataframe: pd.DataFrame) -> pd.DataFrame:
+def calculate_percentage_deviation_from_mean(dataframe: Union[pd.DataFrame, Dict[str, np.ndarray]]) -> pd.DataFrame:
     """
     Calculates the percentage deviation from mean of each column in a given pandas DataFrame. 
 
     Parameters
     ----------
-    dataframe : pandas DataFrame
-        The DataFrame to calculate the percentage deviation.
+    dataframe : pandas DataFrame or dict
+        The DataFrame (or dictionary of arrays) to calculate the percentage deviation.
 
     Returns
     -------
@@ -586,24 +936,25 @@ def calculate_percentage_deviation_from_mean(dataframe: pd.DataFrame) -> pd.Data
         the mean value of that column, divided by the mean value of that column, and then multiplied by 100. This calculation is 
         commonly used in statistical analysis to understand how much each data point in a column varies from the mean of that column.
     """
-    percentage_deviation = pd.DataFrame()
+    percentage_deviation = {}
 
-    for column in dataframe.columns:
-        mean = dataframe[column].mean()
-        deviation = ((dataframe[column] - mean) / mean) * 100
+    for column, values in dataframe.items():
+        mean = _nanmean(values)
+        deviation = ((values - mean) / mean) * 100
         percentage_deviation[column] = deviation
 
-    return percentage_deviation
+    return pd.DataFrame(percentage_deviation)
 
-def calculate_monte_carlo_statistics(dataframe: pd.DataFrame) -> pd.DataFrame:
+def calculate_monte_carlo_statistics(dataframe: Union[pd.DataFrame, Dict[str, np.ndarray]]) -> pd.DataFrame:
     """
     Calculates descriptive statistics on a given pandas DataFrame using Monte Carlo simulation.
 
     Parameters
     ----------
-    dataframe : pandas DataFrame
+    dataframe : pandas DataFrame or dict
         The DataFrame for which to calculate the Monte Carlo statistics. Each column of the DataFrame should contain a result vector
-        from a Monte Carlo simulation.
+        from a Monte Carlo simulation. A dictionary of arrays (as returned by monte_carlo_simulation with return_as_dataframe=False) 
+        can also be given.
 
     Returns
     -------
@@ -616,10 +967,10 @@ def calculate_monte_carlo_statistics(dataframe: pd.DataFrame) -> pd.DataFrame:
     
     statistics = {}
 
-    for column in dataframe.columns:
+    for column, values in dataframe.items():
         
-        mean = dataframe[column].mean()
-        std_dev = dataframe[column].std()
+        mean = _nanmean(values)
+        std_dev = _nanstd(values)
         std_dev_k2 = 2 * std_dev
 
         if mean == 0:
@@ -647,14 +998,14 @@ def calculate_monte_carlo_statistics(dataframe: pd.DataFrame) -> pd.DataFrame:
     return statistics_df.T
 
 
-def monte_carlo_output_correlations(outputs: pd.DataFrame, return_as_dataframe: bool = False) -> Any:
+def monte_carlo_output_correlations(outputs: Union[pd.DataFrame, Dict[str, np.ndarray]], return_as_dataframe: bool = False) -> Any:
     """
     Calculate the Pearson correlation coefficients between each pair of outputs.
 
     Parameters:
     -----------
-    outputs : pandas DataFrame
-        A DataFrame containing the output variables.
+    outputs : pandas DataFrame or dict
+        A DataFrame (or dictionary of arrays) containing the output variables.
     return_as_dataframe : boolean, default False
         If True, return the results as a DataFrame.
         If False, return the results as a dictionary.
@@ -669,20 +1020,17 @@ def monte_carlo_output_correlations(outputs: pd.DataFrame, return_as_dataframe:
             A dictionary containing the pairwise correlation coefficients between the output variables.
             The keys are in the format "output1 and output2".
     """
-    # Calculate the correlation coefficients between each pair of outputs
-    corr_matrix = outputs.corr()
-
-    # Create an empty dataframe to store the results
-    results = pd.DataFrame(columns=corr_matrix.columns, index=corr_matrix.columns)
-
-    # Loop over every pair of outputs and store the correlation coefficient
-    for i in range(len(corr_matrix.columns)):
-        for j in range(i + 1, len(corr_matrix.columns)):
-            output1 = corr_matrix.columns[i]
-            output2 = corr_matrix.columns[j]
-            corr_coeff, p_value = scipy.stats.pearsonr(outputs[output1], outputs[output2])
-            results.loc[output1, output2] = corr_coeff
-            results.loc[output2, output1] = corr_coeff # Add symmetry to the dataframe
+    columns = dict(outputs.items())
+    
+    # Calculate the correlation coefficients between all pairs of outputs in a single call, with one row per output.
+    # Outputs that are constant or contain nan give nan correlation coefficients
+    with np.errstate(divide='ignore', invalid='ignore'):
+        corr_matrix = np.atleast_2d(np.corrcoef(np.vstack([np.asarray(values, dtype=float) for values in columns.values()])))
+    
+    # The correlation of an output with itself is not reported
+    np.fill_diagonal(corr_matrix, np.nan)
+    
+    results = pd.DataFrame(corr_matrix, columns=list(columns), index=list(columns))
 
     if return_as_dataframe:
         return results
@@ -728,12 +1076,12 @@ def filter_uncertainty_results(tag_filter_string: str, uncertainty_results: dict
   
   
     
-def compare_monte_carlo_to_conventional_uncertainty_calculation(MC_results: pd.DataFrame, uncertainty_results: dict) -> pd.DataFrame:
+def compare_monte_carlo_to_conventional_uncertainty_calculation(MC_results: Union[pd.DataFrame, Dict[str, np.ndarray]], uncertainty_results: dict) -> pd.DataFrame:
     '''
     Parameters
     ----------
-    MC_results : pandas DataFrame
-        Dataframe containing results from Monte Carlo simulation (returned by monte_carlo_simulation function)
+    MC_results : pandas DataFrame or dict
+        Dataframe (or dictionary of arrays) containing results from Monte Carlo simulation (returned by monte_carlo_simulation function)
     uncertainty_results : dict
         Dictionary containing all results from traditional uncertainty calculations (returned by calculate_uncertainty function)
 
@@ -745,8 +1093,6 @@ def compare_monte_carlo_to_conventional_uncertainty_calculation(MC_results: pd.D
     '''    
     #Compare conventional uncertainty analysis to Monte Carlo results
 
-    # Calculate the percentage deviation of Monte Carlo results from the mean value
-    MC_results_relative = calculate_percentage_deviation_from_mean(MC_results)
     MC_stats = calculate_monte_carlo_statistics(MC_results)
     # cases[case_name]['Sensitivity_coefficients'] = uncertainty_functions.calculate_sensitivity_coefficients(mc_input_case['mean'], calculate_gas_properties)
     # monte_carlo_output_correlations = monte_carlo_output_correlations(MC_results, True)
@@ -29,7 +29,9 @@ based on various methods from standards, scientific papers, and empirical
 relationships.
 """
 
-from typing import Dict, Optional
+from typing import Dict, Optional, Sequence, Union
+
+import numpy as np
 
 
 # GERG-2008 molar masses (g/mol)
@@ -57,6 +59,56 @@ GERG_2008_MOLAR_MASSES = {
     'Ar': 39.948         # Argon
 }
 
+# GERG-2008 molar masses as an array, and the index of each component in the array
+_GERG_2008_MOLAR_MASS_ARRAY = np.array(list(GERG_2008_MOLAR_MASSES.values()), dtype=np.float64)
+_GERG_2008_INDEX = {component: i for i, component in enumerate(GERG_2008_MOLAR_MASSES)}
+
+
+# NORSOK I-106 (Table 4), used by component_uncertainty_from_norsok_I106. Upper limits of the mass percent ranges, 
+# and the factor of each range
+_NORSOK_I106_MASS_PERCENT_LIMITS = np.array([20.0, 50.0])
+_NORSOK_I106_FACTORS = np.array([0.15, 0.30, 0.60])
+
+# Components supported by component_uncertainty_from_ASTM_D1945. A dict (with no values) gives hashed lookups 
+# while keeping the order of the components for error messages
+_ASTM_D1945_COMPONENTS = dict.fromkeys(('N2', 'CO2', 'C1', 'C2', 'C3', 'iC4', 'nC4', 'iC5', 'nC5', 'nC6', 'nC7', 'nC8', 'nC9', 'nC10'))
+
+# ASTM D1945 reproducibility, used by component_uncertainty_from_ASTM_D1945. Upper limits of the concentration ranges (mol%), 
+# and the standard uncertainty (k=1) of each range, converted from the expanded uncertainty (k=2) by dividing by 2
+_ASTM_D1945_RANGE_LIMITS = np.array([0.1, 1.0, 5.0, 10.0])
+_ASTM_D1945_STANDARD_UNCERTAINTY = np.array([0.02, 0.07, 0.10, 0.12, 0.15]) / 2
+
+
+# Power law regression coefficients (u = a * x^b) from K-lab sample parallel tests, used by component_uncertainty_from_haagenvik2024. 
+# C6+ components use the C6 power law regression. 
+# Methane uncertainty is set to 0% (a = 0) to account for normalization effect. Since methane has the highest concentration 
+# and composition is normalized to 100%, its uncertainty is implicitly influenced by uncertainties in all other components.
+_HAAGENVIK2024_COMPONENTS = ('N2', 'CO2', 'C1', 'C2', 'C3', 'iC4', 'nC4', 'iC5', 'nC5', 'nC6', 'nC7', 'nC8', 'nC9', 'nC10')
+_HAAGENVIK2024_POWER_A = np.array([0.034, 0.013, 0.0, 0.041, 0.025, 0.018, 0.027, 0.016, 0.023, 0.103, 0.103, 0.103, 0.103, 0.103])
+_HAAGENVIK2024_POWER_B = np.array([1.005, 0.514, 0.0, -0.118, 0.970, 0.635, 0.793, 0.383, 0.470, 0.683, 0.683, 0.683, 0.683, 0.683])
+_HAAGENVIK2024_INDEX = {component: i for i, component in enumerate(_HAAGENVIK2024_COMPONENTS)}
+
+
+def _normalize_composition(
+    components: Sequence[str], 
+    composition_mole_percent: Union[Sequence[float], np.ndarray], 
+    supported_components: Dict[str, object]
+) -> np.ndarray:
+    """
+    Check that all components are supported, and normalize the composition(s) to 100 mol% along the last axis. 
+    Used by the array methods in this module. Raises ValueError for unsupported components or a zero total composition.
+    """
+    unsupported_components = [comp for comp in components if comp not in supported_components]
+    if unsupported_components:
+        raise ValueError(f"Unsupported components: {unsupported_components}. Allowed components: {list(supported_components)}")
+    
+    composition_mole_percent = np.asarray(composition_mole_percent, dtype=np.float64)
+    total_composition = composition_mole_percent.sum(axis=-1, keepdims=True)
+    if np.any(total_composition == 0):
+        raise ValueError("Total composition is zero. Cannot normalize.")
+    
+    return composition_mole_percent / total_composition * 100
+
 
 def component_uncertainty_from_ASTM_D1945(composition_mole_percent: Dict[str, float]) -> dict:
     """
@@ -112,50 +164,82 @@ def component_uncertainty_from_ASTM_D1945(composition_mole_percent: Dict[str, fl
     >>> print(uncertainty_data['standard_uncertainty']['C1'])
     0.075
     """
-    allowed_components = ['N2', 'CO2', 'C1', 'C2', 'C3', 'iC4', 'nC4', 'iC5', 'nC5', 'nC6', 'nC7', 'nC8', 'nC9', 'nC10']
-    
-    # Check if all components are supported
-    unsupported_components = [comp for comp in composition_mole_percent.keys() if comp not in allowed_components]
-    if unsupported_components:
-        raise ValueError(f"Unsupported components: {unsupported_components}. Allowed components: {allowed_components}")
-    
-    # Normalize composition to 100%
-    total_composition = sum(composition_mole_percent.values())
-    if total_composition == 0:
-        raise ValueError("Total composition is zero. Cannot normalize.")
-    
-    composition_normalized = {key: (val / total_composition) * 100 for key, val in composition_mole_percent.items()}
-    
-    # Calculate standard uncertainties
-    standard_uncertainty = {}
-    
-    for component, mole_percent in composition_normalized.items():
-        if mole_percent < 0.1:
-            expanded_uncertainty = 0.02
-        elif mole_percent < 1.0:
-            expanded_uncertainty = 0.07
-        elif mole_percent < 5.0:
-            expanded_uncertainty = 0.10
-        elif mole_percent < 10.0:
-            expanded_uncertainty = 0.12
-        else:
-            expanded_uncertainty = 0.15
-        
-        # Convert from expanded uncertainty (k=2) to standard uncertainty (k=1)
-        standard_uncertainty[component] = expanded_uncertainty / 2
+    # Normalize composition to 100% and calculate standard uncertainties
+    components = list(composition_mole_percent)
+    arrays = component_uncertainty_from_ASTM_D1945_array(components, list(composition_mole_percent.values()))
+    composition_normalized = dict(zip(components, arrays['mean'].tolist()))
+    standard_uncertainty = dict(zip(components, arrays['standard_uncertainty'].tolist()))
     
     # Prepare output in standard uncertaintylib format
     result = {
         'mean': composition_normalized,
         'standard_uncertainty': standard_uncertainty,
-        'min': {key: 0.0 for key in composition_normalized},
-        'max': {key: 100.0 for key in composition_normalized},
-        'distribution': {key: 'normal' for key in composition_normalized}
+        'min': dict.fromkeys(composition_normalized, 0.0),
+        'max': dict.fromkeys(composition_normalized, 100.0),
+        'distribution': dict.fromkeys(composition_normalized, 'normal')
     }
     
     return result
 
 
+def component_uncertainty_from_ASTM_D1945_array(
+    components: Sequence[str], 
+    composition_mole_percent: Union[Sequence[float], np.ndarray]
+) -> Dict[str, np.ndarray]:
+    """
+    Estimate gas composition uncertainty according to ASTM D1945 standard, for compositions given as arrays.
+    
+    Same method as component_uncertainty_from_ASTM_D1945, but with the composition given as a sequence of component 
+    names and an aligned array of mole percentages, and the results returned as arrays in the same order. 
+    A 2D array of compositions (for example Monte Carlo samples) is evaluated in one call, with one composition per row.
+    
+    Parameters
+    ----------
+    components : sequence of str
+        Component names. Supported components: N2, CO2, C1, C2, C3, iC4, nC4, iC5, nC5, nC6, nC7, nC8, nC9, nC10.
+        Example: ('C1', 'C2', 'N2')
+    composition_mole_percent : array_like
+        Mole percentages of the components, with shape (n_components,) for a single composition, or 
+        (n_samples, n_components) for several compositions. The last axis is aligned with components. 
+        The compositions do not need to be normalized to 100%.
+        Example: np.array([85.0, 10.0, 5.0])
+    
+    Returns
+    -------
+    dict
+        A dictionary with the following keys:
+        
+        - 'mean' : np.ndarray
+            Normalized mole percentages for each component, with the same shape as composition_mole_percent.
+        - 'standard_uncertainty' : np.ndarray
+            Standard uncertainty (k=1) for each component in absolute terms (mol%), with the same shape as composition_mole_percent.
+    
+    Examples
+    --------
+    >>> result = component_uncertainty_from_ASTM_D1945_array(('C1', 'C2', 'N2'), np.array([85.0, 10.0, 5.0]))
+    >>> print(result['standard_uncertainty'])
+    [0.075 0.075 0.06 ]
+    """
+    # Check if all components are supported, and normalize composition to 100%
+    composition_normalized = _normalize_composition(components, composition_mole_percent, _ASTM_D1945_COMPONENTS)
+    
+    return {
+        'mean': composition_normalized,
+        'standard_uncertainty': _ASTM_D1945_standard_uncertainty(composition_normalized)
+    }
+
+
+def _ASTM_D1945_standard_uncertainty(composition_normalized: np.ndarray) -> np.ndarray:
+    """
+    Standard uncertainties according to ASTM D1945 for a composition normalized to 100 mol%. No validation is done, 
+    use component_uncertainty_from_ASTM_D1945_array for input that is not validated.
+    """
+    # Look up the concentration range of each component
+    return _ASTM_D1945_STANDARD_UNCERTAINTY[
+        np.searchsorted(_ASTM_D1945_RANGE_LIMITS, composition_normalized, side='right')
+    ]
+
+
 def component_uncertainty_from_norsok_I106(composition_mole_percent: Dict[str, float]) -> dict:
     """
     Estimate gas composition uncertainty according to NORSOK I-106:2014 standard.
@@ -232,72 +316,98 @@ def component_uncertainty_from_norsok_I106(composition_mole_percent: Dict[str, f
     ----------
     NORSOK standard I-106:2014: "Fiscal metering systems for hydrocarbon liquid and gas"
     """
-    # All GERG-2008 components are allowed
-    allowed_components = list(GERG_2008_MOLAR_MASSES.keys())
+    # Normalize composition to 100% and calculate standard uncertainties
+    components = list(composition_mole_percent)
+    arrays = component_uncertainty_from_norsok_I106_array(components, list(composition_mole_percent.values()))
+    composition_normalized = dict(zip(components, arrays['mean'].tolist()))
+    standard_uncertainty = dict(zip(components, arrays['standard_uncertainty'].tolist()))
     
-    # Check if all components are supported
-    unsupported_components = [comp for comp in composition_mole_percent.keys() if comp not in allowed_components]
-    if unsupported_components:
-        raise ValueError(f"Unsupported components: {unsupported_components}. Allowed components: {allowed_components}")
+    # Prepare output in standard uncertaintylib format
+    result = {
+        'mean': composition_normalized,
+        'standard_uncertainty': standard_uncertainty,
+        'min': dict.fromkeys(composition_normalized, 0.0),
+        'max': dict.fromkeys(composition_normalized, 100.0),
+        'distribution': dict.fromkeys(composition_normalized, 'normal')
+    }
     
-    # Normalize composition to 100%
-    total_composition = sum(composition_mole_percent.values())
-    if total_composition == 0:
-        raise ValueError("Total composition is zero. Cannot normalize.")
+    return result
+
+
+def component_uncertainty_from_norsok_I106_array(
+    components: Sequence[str], 
+    composition_mole_percent: Union[Sequence[float], np.ndarray]
+) -> Dict[str, np.ndarray]:
+    """
+    Estimate gas composition uncertainty according to NORSOK I-106:2014 standard, for compositions given as arrays.
     
-    composition_normalized = {key: (val / total_composition) * 100 for key, val in composition_mole_percent.items()}
+    Same method as component_uncertainty_from_norsok_I106, but with the composition given as a sequence of component 
+    names and an aligned array of mole percentages, and the results returned as arrays in the same order. 
+    A 2D array of compositions (for example Monte Carlo samples) is evaluated in one call, with one composition per row.
     
-    # Calculate average molar mass of the gas mixture
-    average_molar_mass = sum([
-        composition_normalized[comp] * GERG_2008_MOLAR_MASSES[comp] 
-        for comp in composition_normalized
-    ]) / 100  # Divide by 100 because composition is in mol%
+    Parameters
+    ----------
+    components : sequence of str
+        Component names. Supports all GERG-2008 components (see component_uncertainty_from_norsok_I106).
+        Example: ('C1', 'C2', 'N2')
+    composition_mole_percent : array_like
+        Mole percentages of the components, with shape (n_components,) for a single composition, or 
+        (n_samples, n_components) for several compositions. The last axis is aligned with components. 
+        The compositions do not need to be normalized to 100%.
+        Example: np.array([85.0, 10.0, 5.0])
     
-    # Convert mole percent to mass percent for factor determination
-    # mass_i = mole_percent_i * M_i
-    total_mass = sum([
-        composition_normalized[comp] * GERG_2008_MOLAR_MASSES[comp]
-        for comp in composition_normalized
-    ])
-    
-    composition_mass_percent = {
-        comp: (composition_normalized[comp] * GERG_2008_MOLAR_MASSES[comp] / total_mass) * 100
-        for comp in composition_normalized
-    }
+    Returns
+    -------
+    dict
+        A dictionary with the following keys:
+        
+        - 'mean' : np.ndarray
+            Normalized mole percentages for each component, with the same shape as composition_mole_percent.
+        - 'standard_uncertainty' : np.ndarray
+            Standard uncertainty (k=1) for each component in absolute terms (mol%), with the same shape as composition_mole_percent.
     
-    # Calculate standard uncertainties
-    standard_uncertainty = {}
+    Examples
+    --------
+    >>> result = component_uncertainty_from_norsok_I106_array(('C1', 'C2', 'N2'), np.array([85.0, 10.0, 5.0]))
+    >>> print(round(result['standard_uncertainty'][0], 4))
+    0.3374
+    """
+    # Check if all components are supported, and normalize composition to 100%
+    composition_normalized = _normalize_composition(components, composition_mole_percent, GERG_2008_MOLAR_MASSES)
     
-    for component, mole_percent in composition_normalized.items():
-        component_molar_mass = GERG_2008_MOLAR_MASSES[component]
-        mass_percent = composition_mass_percent[component]
-        
-        # Determine factor based on MASS percent (not mole percent)
-        # According to NORSOK I-106, Table 4
-        if mass_percent < 20:
-            factor = 0.15
-        elif mass_percent < 50:
-            factor = 0.30
-        else:
-            factor = 0.60
-        
-        # Calculate expanded uncertainty (k=2) according to NORSOK I-106
-        # Uncertainty is given in mol%, not mass%
-        expanded_uncertainty = factor * average_molar_mass / component_molar_mass
-        
-        # Convert from expanded uncertainty (k=2) to standard uncertainty (k=1)
-        standard_uncertainty[component] = expanded_uncertainty / 2
+    molar_masses = _GERG_2008_MOLAR_MASS_ARRAY[[_GERG_2008_INDEX[comp] for comp in components]]
     
-    # Prepare output in standard uncertaintylib format
-    result = {
+    return {
         'mean': composition_normalized,
-        'standard_uncertainty': standard_uncertainty,
-        'min': {key: 0.0 for key in composition_normalized},
-        'max': {key: 100.0 for key in composition_normalized},
-        'distribution': {key: 'normal' for key in composition_normalized}
+        'standard_uncertainty': _norsok_I106_standard_uncertainty(composition_normalized, molar_masses)
     }
+
+
+def _norsok_I106_standard_uncertainty(composition_normalized: np.ndarray, molar_masses: np.ndarray) -> np.ndarray:
+    """
+    Standard uncertainties according to NORSOK I-106 for a composition normalized to 100 mol%, with the molar masses 
+    of the components aligned with the last axis. No validation is done, use component_uncertainty_from_norsok_I106_array 
+    for input that is not validated.
+    """
+    # Convert mole percent to mass percent for factor determination
+    # mass_i = mole_percent_i * M_i
+    mass = composition_normalized * molar_masses
+    total_mass = mass.sum(axis=-1, keepdims=True)
+    composition_mass_percent = mass / total_mass * 100
     
-    return result
+    # Average molar mass of the gas mixture. Divide by 100 because composition is in mol%
+    average_molar_mass = total_mass / 100
+    
+    # Determine factor based on MASS percent (not mole percent)
+    # According to NORSOK I-106, Table 4
+    factor = _NORSOK_I106_FACTORS[np.searchsorted(_NORSOK_I106_MASS_PERCENT_LIMITS, composition_mass_percent, side='right')]
+    
+    # Calculate expanded uncertainty (k=2) according to NORSOK I-106
+    # Uncertainty is given in mol%, not mass%
+    expanded_uncertainty = factor * average_molar_mass / molar_masses
+    
+    # Convert from expanded uncertainty (k=2) to standard uncertainty (k=1)
+    return expanded_uncertainty / 2
 
 
 def component_uncertainty_from_haagenvik2024(
@@ -395,72 +505,106 @@ def component_uncertainty_from_haagenvik2024(
     Density and Isentropic Exponent." Presented at NFOGM 2024.
     https://nfogm.no/wp-content/uploads/2025/08/1-Single-Phase-1-Exploring-the-Relationship-between-Speed-of-Sound-Density-and-Isentropic-Exponent-Christian-Hagenvik_Equinor.pdf
     """
-    allowed_components = ['N2', 'CO2', 'C1', 'C2', 'C3', 'iC4', 'nC4', 'iC5', 'nC5', 'nC6', 'nC7', 'nC8', 'nC9', 'nC10']
+    # Normalize composition to 100% and calculate standard uncertainties
+    components = list(composition_mole_percent)
+    arrays = component_uncertainty_from_haagenvik2024_array(
+        components, list(composition_mole_percent.values()), lower_uncertainty_limit=lower_uncertainty_limit
+    )
+    composition_normalized = dict(zip(components, arrays['mean'].tolist()))
+    standard_uncertainty = dict(zip(components, arrays['standard_uncertainty'].tolist()))
     
-    # Check if all components are supported
-    unsupported_components = [comp for comp in composition_mole_percent.keys() if comp not in allowed_components]
-    if unsupported_components:
-        raise ValueError(f"Unsupported components: {unsupported_components}. Allowed components: {allowed_components}")
+    # Prepare output in standard uncertaintylib format
+    result = {
+        'mean': composition_normalized,
+        'standard_uncertainty': standard_uncertainty,
+        'min': dict.fromkeys(composition_normalized, 0.0),
+        'max': dict.fromkeys(composition_normalized, 100.0),
+        'distribution': dict.fromkeys(composition_normalized, 'normal')
+    }
     
-    # Normalize composition to 100%
-    total_composition = sum(composition_mole_percent.values())
-    if total_composition == 0:
-        raise ValueError("Total composition is zero. Cannot normalize.")
+    return result
+
+
+def component_uncertainty_from_haagenvik2024_array(
+    components: Sequence[str], 
+    composition_mole_percent: Union[Sequence[float], np.ndarray], 
+    lower_uncertainty_limit: Optional[float] = None
+) -> Dict[str, np.ndarray]:
+    """
+    Estimate gas composition uncertainty using the Hagenvik et al. (2024) method, for compositions given as arrays.
     
-    composition_normalized = {key: (val / total_composition) * 100 for key, val in composition_mole_percent.items()}
-    
-    # Power law regression coefficients from K-lab sample parallel tests
-    power_models = {
-        'N2': {'power_a': 0.034, 'power_b': 1.005},
-        'CO2': {'power_a': 0.013, 'power_b': 0.514},
-        'C2': {'power_a': 0.041, 'power_b': -0.118},
-        'C3': {'power_a': 0.025, 'power_b': 0.970},
-        'iC4': {'power_a': 0.018, 'power_b': 0.635},
-        'nC4': {'power_a': 0.027, 'power_b': 0.793},
-        'iC5': {'power_a': 0.016, 'power_b': 0.383},
-        'nC5': {'power_a': 0.023, 'power_b': 0.470},
-        'C6': {'power_a': 0.103, 'power_b': 0.683}
-    }
+    Same method as component_uncertainty_from_haagenvik2024, but with the composition given as a sequence of component 
+    names and an aligned array of mole percentages, and the results returned as arrays in the same order. 
+    A 2D array of compositions (for example Monte Carlo samples) is evaluated in one call, with one composition per row.
     
-    # Calculate standard uncertainties
-    standard_uncertainty = {}
+    Parameters
+    ----------
+    components : sequence of str
+        Component names. Supported components: N2, CO2, C1, C2, C3, iC4, nC4, iC5, nC5, nC6, nC7, nC8, nC9, nC10.
+        Example: ('C1', 'C2', 'N2')
+    composition_mole_percent : array_like
+        Mole percentages of the components, with shape (n_components,) for a single composition, or 
+        (n_samples, n_components) for several compositions. The last axis is aligned with components. 
+        The compositions do not need to be normalized to 100%.
+        Example: np.array([85.0, 10.0, 5.0])
+    lower_uncertainty_limit : float, optional
+        Optional lower limit for uncertainty estimates (mol%), see component_uncertainty_from_haagenvik2024. 
+        Default is None (no lower limit applied).
     
-    for component, mole_percent in composition_normalized.items():
-        if mole_percent == 0:
-            # Zero concentration means zero uncertainty
-            standard_uncertainty[component] = 0.0
-        
-        elif component == 'C1':
-            # Methane uncertainty is set to 0% to account for normalization effect.
-            # Since methane has the highest concentration and composition is normalized 
-            # to 100%, its uncertainty is implicitly influenced by uncertainties in 
-            # all other components.
-            standard_uncertainty[component] = 0.0
-        
-        elif component in power_models:
-            # Apply power law regression for components with available models
-            params = power_models[component]
-            standard_uncertainty[component] = params['power_a'] * (mole_percent ** params['power_b'])
-        
-        elif component in ['nC6', 'nC7', 'nC8', 'nC9', 'nC10']:
-            # C6+ components use the C6 power law regression
-            params = power_models['C6']
-            standard_uncertainty[component] = params['power_a'] * (mole_percent ** params['power_b'])
-        
-        else:
-            raise ValueError(f"Component '{component}' is not supported by this method.")
+    Returns
+    -------
+    dict
+        A dictionary with the following keys:
         
-        # Apply optional lower uncertainty limit
-        if lower_uncertainty_limit is not None and standard_uncertainty[component] < lower_uncertainty_limit:
-            standard_uncertainty[component] = lower_uncertainty_limit
+        - 'mean' : np.ndarray
+            Normalized mole percentages for each component, with the same shape as composition_mole_percent.
+        - 'standard_uncertainty' : np.ndarray
+            Standard uncertainty (k=1) for each component in absolute terms (mol%), with the same shape as composition_mole_percent.
     
-    # Prepare output in standard uncertaintylib format
-    result = {
+    Examples
+    --------
+    >>> result = component_uncertainty_from_haagenvik2024_array(('C1', 'C2', 'N2'), np.array([85.0, 10.0, 5.0]))
+    >>> print(result['standard_uncertainty'].round(4))
+    [0.     0.0312 0.1714]
+    """
+    # Check if all components are supported, and normalize composition to 100%
+    composition_normalized = _normalize_composition(components, composition_mole_percent, _HAAGENVIK2024_INDEX)
+    
+    index = [_HAAGENVIK2024_INDEX[component] for component in components]
+    
+    return {
         'mean': composition_normalized,
-        'standard_uncertainty': standard_uncertainty,
-        'min': {key: 0.0 for key in composition_normalized},
-        'max': {key: 100.0 for key in composition_normalized},
-        'distribution': {key: 'normal' for key in composition_normalized}
+        'standard_uncertainty': _haagenvik2024_standard_uncertainty(
+            composition_normalized, 
+            _HAAGENVIK2024_POWER_A[index], 
+            _HAAGENVIK2024_POWER_B[index], 
+            lower_uncertainty_limit
+        )
     }
-    
-    return result
\ No newline at end of file
+
+
+def _haagenvik2024_standard_uncertainty(
+    composition_normalized: np.ndarray, 
+    power_a: np.ndarray, 
+    power_b: np.ndarray, 
+    lower_uncertainty_limit: Optional[float] = None
+) -> np.ndarray:
+    """
+    Standard uncertainties according to Hagenvik et al. (2024) for a composition normalized to 100 mol%, with the power 
+    law coefficients of the components aligned with the last axis. No validation is done, use 
+    component_uncertainty_from_haagenvik2024_array for input that is not validated.
+    """
+    # Calculate standard uncertainties with the power law regression of each component. 
+    # Zero concentration means zero uncertainty (the power law is not evaluated for these)
+    standard_uncertainty = power_a * np.power(
+        composition_normalized, 
+        power_b, 
+        out=np.zeros_like(composition_normalized), 
+        where=composition_normalized > 0
+    )
+    
+    # Apply optional lower uncertainty limit
+    if lower_uncertainty_limit is not None:
+        standard_uncertainty = np.maximum(standard_uncertainty, lower_uncertainty_limit)
+    
+    return standard_uncertainty